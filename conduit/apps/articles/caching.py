@@ -0,0 +1,56 @@
+"""
+Generations of the cached and ETagged article responses, see
+CachedResponseMixin. A write bumps the namespaces of what it changed, so it
+only invalidates the responses that show it:
+
+- `articles`: every list of articles.
+- `article:<slug>`: that article on its own; `article` all of them at once.
+- `viewer:<user pk>`: the articles' `favorited` and their authors'
+  `following` as that user sees them.
+"""
+from conduit.apps.core.cache import bump_generation
+from conduit.apps.profiles.models import Profile
+
+from .models import Article
+
+LIST_NAMESPACE = 'articles'
+ARTICLES_NAMESPACE = 'article'
+
+
+def get_article_namespace(slug):
+    return 'article:{0}'.format(slug)
+
+
+def get_viewer_namespace(user_id):
+    return 'viewer:{0}'.format(user_id)
+
+
+def invalidate_articles(slugs):
+    """Invalidate the lists and the articles with `slugs`."""
+    bump_generation(
+        LIST_NAMESPACE, *(get_article_namespace(slug) for slug in slugs)
+    )
+
+
+def invalidate_all_articles():
+    """Invalidate the lists and every article, e.g. after a bulk write."""
+    bump_generation(LIST_NAMESPACE, ARTICLES_NAMESPACE)
+
+
+def invalidate_authors(profile_ids):
+    """Invalidate the lists and every article by `profile_ids`."""
+    invalidate_articles(Article.all_objects.filter(
+        author_id__in=profile_ids
+    ).values_list('slug', flat=True))
+
+
+def invalidate_viewers(user_ids):
+    """Invalidate the favorites and follows the users of `user_ids` see."""
+    bump_generation(*(get_viewer_namespace(user_id) for user_id in user_ids))
+
+
+def invalidate_profile_viewers(profile_ids):
+    """`invalidate_viewers` for the users of `profile_ids`."""
+    invalidate_viewers(Profile.objects.filter(
+        pk__in=profile_ids
+    ).values_list('user_id', flat=True))
@@ -0,0 +1,164 @@
+import json
+import sys
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from conduit.apps.articles import bulk
+from conduit.apps.articles.models import Article
+from conduit.apps.articles.relations import get_tags
+from conduit.apps.articles.utils import generate_article_slug
+from conduit.apps.profiles.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        'Import articles from newline-delimited JSON, one article per line: '
+        '{"author": "<username>", "title": ..., "description": ..., '
+        '"body": ..., "tagList": [...]}. Use - to read from stdin.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of articles written per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            self.import_lines(sys.stdin, options['chunk_size'])
+            return
+
+        try:
+            with open(options['path'], encoding='utf-8') as lines:
+                self.import_lines(lines, options['chunk_size'])
+        except IOError as e:
+            raise CommandError(str(e))
+
+    def import_lines(self, lines, chunk_size):
+        lines = enumerate(lines, start=1)
+        imported = skipped = 0
+
+        while True:
+            chunk = list(islice(lines, chunk_size))
+
+            if not chunk:
+                break
+
+            rows = [row for row in map(self.parse, chunk) if row is not None]
+            count = self.import_chunk(rows)
+
+            imported += count
+            skipped += len(chunk) - count
+
+            self.stdout.write(
+                'Imported {0} articles, skipped {1}.'.format(imported, skipped)
+            )
+
+    def parse(self, numbered_line):
+        number, line = numbered_line
+
+        if not line.strip():
+            return None
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            return self.skip(number, 'not valid JSON')
+
+        if not isinstance(row, dict):
+            return self.skip(number, 'not a JSON object')
+
+        for key in ('author', 'title', 'body'):
+            if not isinstance(row.get(key, None), str) or not row[key]:
+                return self.skip(number, '"{0}" is missing'.format(key))
+
+        tags = row.get('tagList', [])
+
+        if not isinstance(tags, list) or not all(
+            isinstance(tag, str) for tag in tags
+        ):
+            return self.skip(number, '"tagList" must be a list of strings')
+
+        row['number'] = number
+
+        return row
+
+    def skip(self, number, reason):
+        self.stderr.write('Line {0}: {1}, skipped.'.format(number, reason))
+
+    def import_chunk(self, rows):
+        """
+        Write `rows` with a fixed number of queries: one for the authors,
+        one (usually) to check the slugs, a few for the tags, and those of
+        `bulk.create_articles`.
+        """
+        authors = dict(Profile.objects.filter(
+            user__username__in=set(row['author'] for row in rows)
+        ).values_list('user__username', 'pk'))
+
+        for row in rows:
+            if row['author'] not in authors:
+                self.skip(row['number'], 'unknown author')
+
+        rows = [row for row in rows if row['author'] in authors]
+
+        if not rows:
+            return 0
+
+        slugs = self.generate_slugs(rows)
+
+        articles = [
+            Article(
+                slug=slug,
+                title=row['title'],
+                description=row.get('description', '') or '',
+                body=row['body'],
+                author_id=authors[row['author']]
+            )
+            for row, slug in zip(rows, slugs)
+        ]
+
+        with transaction.atomic():
+            # Inside the chunk's transaction, so tags created for a chunk
+            # that fails are rolled back with it and never cached.
+            tags = get_tags(set(
+                tag for row in rows for tag in row.get('tagList', [])
+            ))
+            tags = dict((tag.slug, tag) for tag in tags)
+
+            bulk.create_articles(articles, [
+                [tags[name.lower()] for name in row.get('tagList', [])]
+                for row in rows
+            ])
+
+        return len(articles)
+
+    def generate_slugs(self, rows):
+        """
+        Generate a unique slug for every row, checking all of them against
+        the database at once and regenerating the few that collide.
+        """
+        slugs = [generate_article_slug(row['title']) for row in rows]
+        pending = list(range(len(rows)))
+
+        while pending:
+            taken = set(Article.all_objects.filter(
+                slug__in=[slugs[i] for i in pending]
+            ).values_list('slug', flat=True))
+
+            seen = set(slugs[i] for i in range(len(rows)) if i not in pending)
+            collisions = []
+
+            for i in pending:
+                if slugs[i] in taken or slugs[i] in seen:
+                    slugs[i] = generate_article_slug(rows[i]['title'])
+                    collisions.append(i)
+                else:
+                    seen.add(slugs[i])
+
+            pending = collisions
+
+        return slugs
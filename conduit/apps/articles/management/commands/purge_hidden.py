@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from conduit.apps.articles import caching, purge
+from conduit.apps.articles.models import Article
+from conduit.apps.profiles.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete hidden articles, and the comments, favorites and follows '
+        'of deactivated profiles, a batch at a time so other writers never '
+        'wait long for the database. Run it periodically.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of rows deleted per transaction.'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Seconds to wait between transactions.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pause = options['pause']
+        articles = profiles = deleted = 0
+
+        for article in Article.all_objects.filter(
+            hidden_at__isnull=False
+        ).only('pk').order_by('pk').iterator():
+            deleted += purge.purge_article(article, batch_size, pause)
+            articles += 1
+
+        for profile in Profile.objects.filter(
+            user__is_active=False
+        ).only('pk').order_by('pk').iterator():
+            purged = purge.purge_profile(profile, batch_size, pause)
+
+            if purged:
+                deleted += purged
+                profiles += 1
+
+        if deleted:
+            caching.invalidate_all_articles()
+
+        self.stdout.write(
+            'Purged {0} hidden articles and {1} deactivated profiles, '
+            '{2} rows in all.'.format(articles, profiles, deleted)
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from conduit.apps.articles import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the articles table.'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError(
+                'The search index does not exist. It needs SQLite with '
+                'FTS5; run migrate to create it.'
+            )
+
+        search.rebuild_index()
+
+        self.stdout.write('Rebuilt the search index.')
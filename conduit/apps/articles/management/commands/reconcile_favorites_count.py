@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from conduit.apps.articles import caching
+from conduit.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Article.favorites_count from the favorites table for '
+        'articles whose stored count has drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles checked per query.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        checked = fixed = 0
+
+        while True:
+            batch = list(Article.objects.filter(
+                pk__gt=last_pk
+            ).order_by('pk').values(
+                'pk', 'favorites_count'
+            ).annotate(actual=Count('favorited_by'))[:batch_size])
+
+            if not batch:
+                break
+
+            drifted = [
+                row for row in batch
+                if row['favorites_count'] != row['actual']
+            ]
+
+            with transaction.atomic():
+                for row in drifted:
+                    Article.objects.filter(pk=row['pk']).update(
+                        favorites_count=row['actual']
+                    )
+
+            last_pk = batch[-1]['pk']
+            checked += len(batch)
+            fixed += len(drifted)
+
+        if fixed:
+            caching.invalidate_all_articles()
+
+        self.stdout.write(
+            'Checked {0} articles, fixed {1}.'.format(checked, fixed)
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from conduit.apps.articles import caching, rendering
+from conduit.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        'Render Article.body_html for articles rendered by another '
+        'renderer version than the current one, or for every article with '
+        '--all.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of articles rendered per transaction.'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Render every article, whatever its renderer version.'
+        )
+
+    def handle(self, *args, **options):
+        version = rendering.get_renderer_version()
+        articles = Article.objects.all()
+
+        if not options['all']:
+            articles = articles.exclude(body_html_version=version)
+
+        last_pk = 0
+        rendered = 0
+
+        while True:
+            batch = list(articles.filter(
+                pk__gt=last_pk
+            ).order_by('pk').values_list('pk', 'body')[:options['batch_size']])
+
+            if not batch:
+                break
+
+            with transaction.atomic():
+                for pk, body in batch:
+                    # Keyed on the body too, so an edit made since the batch
+                    # was read isn't overwritten with stale HTML.
+                    Article.objects.filter(pk=pk, body=body).update(
+                        body_html=rendering.render_body(body),
+                        body_html_version=version
+                    )
+
+            last_pk = batch[-1][0]
+            rendered += len(batch)
+
+            self.stdout.write('Rendered {0} articles.'.format(rendered))
+
+        if rendered:
+            caching.invalidate_all_articles()
+
+        self.stdout.write(
+            'All articles are rendered with version {0}.'.format(version)
+        )
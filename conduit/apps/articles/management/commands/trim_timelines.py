@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from conduit.apps.articles import timelines
+
+
+class Command(BaseCommand):
+    help = (
+        'Trim every feed timeline longer than CONDUIT_FEED_TIMELINE_LENGTH. '
+        'New articles are added to timelines without trimming them, so run '
+        'it periodically.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=timelines.TRIM_BATCH_SIZE,
+            help='Number of timelines trimmed per transaction.'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Seconds to wait between transactions.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        profile_ids = timelines.find_overfull()
+
+        for start in range(0, len(profile_ids), batch_size):
+            with transaction.atomic():
+                timelines.trim(profile_ids[start:start + batch_size])
+
+            time.sleep(options['pause'])
+
+        self.stdout.write('Trimmed {0} timelines.'.format(len(profile_ids)))
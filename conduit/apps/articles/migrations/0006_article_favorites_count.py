@@ -0,0 +1,40 @@
+# Generated by Django 2.0 on 2026-10-18 20:25
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_favorites_count(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Profile = apps.get_model('profiles', 'Profile')
+    Favorite = Profile.favorites.through
+
+    favorites = Favorite.objects.filter(
+        article_id=OuterRef('pk')
+    ).order_by().values('article_id').annotate(
+        count=Count('pk')
+    ).values('count')
+
+    Article.objects.update(favorites_count=Coalesce(
+        Subquery(favorites, output_field=IntegerField()), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_timelineentry'),
+        ('profiles', '0003_profile_favorites'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            populate_favorites_count, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 2.0 on 2026-10-18 20:30
+
+from django.db import migrations
+
+# FTS5 is SQLite only; on other backends search falls back to icontains.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE articles_article_fts USING fts5(
+        title, description, body,
+        content='articles_article', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER articles_article_fts_insert
+    AFTER INSERT ON articles_article BEGIN
+        INSERT INTO articles_article_fts(rowid, title, description, body)
+        VALUES (new.id, new.title, new.description, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER articles_article_fts_delete
+    AFTER DELETE ON articles_article BEGIN
+        INSERT INTO articles_article_fts(
+            articles_article_fts, rowid, title, description, body
+        )
+        VALUES ('delete', old.id, old.title, old.description, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER articles_article_fts_update
+    AFTER UPDATE OF title, description, body ON articles_article BEGIN
+        INSERT INTO articles_article_fts(
+            articles_article_fts, rowid, title, description, body
+        )
+        VALUES ('delete', old.id, old.title, old.description, old.body);
+        INSERT INTO articles_article_fts(rowid, title, description, body)
+        VALUES (new.id, new.title, new.description, new.body);
+    END
+    """,
+    "INSERT INTO articles_article_fts(articles_article_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS articles_article_fts_insert',
+    'DROP TRIGGER IF EXISTS articles_article_fts_delete',
+    'DROP TRIGGER IF EXISTS articles_article_fts_update',
+    'DROP TABLE IF EXISTS articles_article_fts',
+]
+
+
+def fts5_available(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return False
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        options = [row[0] for row in cursor.fetchall()]
+
+    return 'ENABLE_FTS5' in options
+
+
+def create_search_index(apps, schema_editor):
+    if fts5_available(schema_editor):
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_article_author_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
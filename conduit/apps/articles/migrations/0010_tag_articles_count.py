@@ -0,0 +1,43 @@
+# Generated by Django 2.0 on 2026-10-18 20:31
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_articles_count(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Tag = apps.get_model('articles', 'Tag')
+    ArticleTag = Article.tags.through
+
+    articles = ArticleTag.objects.filter(
+        tag_id=OuterRef('pk')
+    ).order_by().values('tag_id').annotate(
+        count=Count('pk')
+    ).values('count')
+
+    Tag.objects.update(articles_count=Coalesce(
+        Subquery(articles, output_field=IntegerField()), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_comment_article_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='articles_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-articles_count', 'slug'], name='tag_articles_count_idx'),
+        ),
+        migrations.RunPython(
+            populate_articles_count, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.0 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_tag_articles_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='body_html',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='body_html_version',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0 on 2026-10-18 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_article_body_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='hidden_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 2.0 on 2026-10-19 09:12
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_timelines(apps, schema_editor):
+    """
+    Give every profile the timeline it would have had if it had followed
+    its followees after migration 0005, which started timelines empty.
+    """
+    Article = apps.get_model('articles', 'Article')
+    Profile = apps.get_model('profiles', 'Profile')
+    TimelineEntry = apps.get_model('articles', 'TimelineEntry')
+    Follow = Profile.follows.through
+
+    length = getattr(settings, 'CONDUIT_FEED_TIMELINE_LENGTH', 1000)
+    followees = {}
+
+    for follower_id, followee_id in Follow.objects.values_list(
+        'from_profile_id', 'to_profile_id'
+    ).iterator():
+        followees.setdefault(follower_id, []).append(followee_id)
+
+    for follower_id, followee_ids in followees.items():
+        articles = Article.objects.filter(
+            author_id__in=followee_ids, hidden_at__isnull=True
+        ).order_by('-created_at', '-id').values_list(
+            'id', 'created_at'
+        )[:length]
+
+        existing = set(TimelineEntry.objects.filter(
+            profile_id=follower_id
+        ).values_list('article_id', flat=True))
+
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(
+                profile_id=follower_id, article_id=pk, created_at=created_at
+            )
+            for pk, created_at in articles if pk not in existing
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_article_hidden_at'),
+        ('profiles', '0004_profile_follow_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.0 on 2026-10-18 21:30
+
+from django.db import migrations
+
+from conduit.apps.articles import search
+
+
+def recreate_search_triggers(apps, schema_editor):
+    # 0011_article_body_html and 0012_article_hidden_at rebuilt the
+    # articles table on SQLite, dropping the triggers 0008_article_search
+    # created; articles written since then are missing from the index.
+    search.create_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_backfill_timelines'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            recreate_search_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -2,6 +2,14 @@ from django.db import models
 
 from conduit.apps.core.models import TimestampedModel
 
+class ArticleManager(models.Manager):
+    """The articles that haven't been hidden, see `Article.hidden_at`."""
+
+    def get_queryset(self):
+        return super(ArticleManager, self).get_queryset().filter(
+            hidden_at__isnull=True
+        )
+
 class Article(TimestampedModel):
     slug = models.SlugField(db_index=True, max_length=255, unique=True)
     title = models.CharField(db_index=True, max_length=255)
@@ -9,6 +17,13 @@ class Article(TimestampedModel):
     description = models.TextField()
     body = models.TextField()
 
+    # `body` rendered to sanitized HTML when the article is saved, and the
+    # renderer version that did it; see `articles.rendering`.
+    body_html = models.TextField(blank=True, default='')
+    body_html_version = models.CharField(
+        blank=True, default='', max_length=32
+    )
+
     author = models.ForeignKey(
         'profiles.Profile', on_delete=models.CASCADE, related_name='articles'
     )
@@ -17,6 +32,34 @@ class Article(TimestampedModel):
         'articles.Tag', related_name='articles'
     )
 
+    # Number of profiles that favorited this article. Kept in step with
+    # `Profile.favorites` on write so reads never have to count; see the
+    # `reconcile_favorites_count` command for repairing drift.
+    favorites_count = models.PositiveIntegerField(default=0)
+
+    # When the article was deleted or its author deactivated. Hidden
+    # articles are left out of `objects` straight away; the `purge_hidden`
+    # command deletes them and their comments and favorites later, in
+    # small batches. Not indexed: nearly every row is NULL, and SQLite
+    # would pick such an index over the ordering ones below.
+    hidden_at = models.DateTimeField(blank=True, null=True)
+
+    objects = ArticleManager()
+    all_objects = models.Manager()
+
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # Matches KeysetPagination.ordering for the article list.
+            models.Index(
+                fields=['-created_at', '-id'], name='article_created_id_idx'
+            ),
+            # Same ordering for the `author` filter on the article list.
+            models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='article_author_created_idx'
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -32,9 +75,60 @@ class Comment(TimestampedModel):
         'profiles.Profile', related_name='comments', on_delete=models.CASCADE
     )
 
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # Matches KeysetPagination.ordering for an article's comments.
+            models.Index(
+                fields=['article', '-created_at', '-id'],
+                name='comment_article_created_idx'
+            ),
+        ]
+
 class Tag(TimestampedModel):
     tag = models.CharField(max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
 
+    # Number of articles with this tag, kept in step with `Article.tags` on
+    # write so the most popular tags are read straight off an index.
+    articles_count = models.PositiveIntegerField(default=0)
+
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['-articles_count', 'slug'],
+                name='tag_articles_count_idx'
+            ),
+        ]
+
     def __str__(self):
         return self.tag
+
+
+class TimelineEntry(models.Model):
+    """
+    An article in the feed of `profile`, i.e. one written by a profile it
+    follows. Entries are written when an article is created and when
+    `profile` follows or unfollows someone, so reading a feed is a single
+    range scan over `profile`'s entries.
+    """
+    profile = models.ForeignKey(
+        'profiles.Profile', related_name='timeline', on_delete=models.CASCADE
+    )
+
+    article = models.ForeignKey(
+        'articles.Article', related_name='timeline_entries',
+        on_delete=models.CASCADE
+    )
+
+    # Copy of `article.created_at` so the feed is ordered by this table's
+    # index alone.
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('profile', 'article')
+        indexes = [
+            models.Index(
+                fields=['profile', '-created_at', '-id'],
+                name='timeline_profile_created_idx'
+            ),
+        ]
@@ -0,0 +1,169 @@
+"""
+Deleting articles and deactivating profiles without long transactions.
+
+Deleting an article through its `on_delete=CASCADE` chain removes every
+comment, favorite and timeline entry in one transaction, holding SQLite's
+write lock for as long as that takes. Instead, `hide_article` and
+`deactivate_profile` only mark rows as hidden, which takes effect at once,
+and the `purge_hidden` command removes what depends on them later in
+batches of bounded size, each in its own short transaction.
+"""
+import time
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from conduit.apps.profiles.models import Profile
+
+from . import caching, tags
+from .models import Article, Comment, TimelineEntry
+
+Favorite = Profile.favorites.through
+Follow = Profile.follows.through
+
+
+def hide_article(article):
+    """Hide `article` now and leave deleting it to `purge_hidden`."""
+    with transaction.atomic():
+        article.hidden_at = timezone.now()
+        article.save(update_fields=['hidden_at'])
+
+        # Hidden articles no longer count towards their tags.
+        article.tags.clear()
+
+
+def deactivate_profile(profile):
+    """
+    Deactivate `profile`'s user and hide its articles now, and leave
+    deleting its articles, comments, favorites and follows to
+    `purge_hidden`.
+    """
+    with transaction.atomic():
+        user = profile.user
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+
+        article_tags = Article.tags.through.objects.filter(
+            article__author=profile
+        )
+        counts = Counter(article_tags.values_list('tag_id', flat=True))
+        article_tags.delete()
+        tags.update_articles_count(
+            dict((pk, -count) for pk, count in counts.items())
+        )
+
+        Article.objects.filter(author=profile).update(
+            hidden_at=timezone.now()
+        )
+
+    caching.invalidate_authors([profile.pk])
+
+
+def purge_article(article, batch_size, pause=0):
+    """
+    Delete the comments, favorites and timeline entries of the hidden
+    `article` in batches, then the article itself. Returns the number of
+    rows deleted.
+    """
+    deleted = sum(
+        delete_in_batches(queryset, batch_size, pause)
+        for queryset in (
+            Comment.objects.filter(article_id=article.pk),
+            Favorite.objects.filter(article_id=article.pk),
+            TimelineEntry.objects.filter(article_id=article.pk),
+        )
+    )
+
+    # Nothing large is left to cascade to.
+    article.delete()
+
+    return deleted + 1
+
+
+def purge_profile(profile, batch_size, pause=0):
+    """
+    Delete the comments, favorites, follows and timeline of the deactivated
+    `profile` in batches, keeping the counts of what they pointed at in
+    step. Returns the number of rows deleted.
+    """
+    def unfavorite(article_ids):
+        _decrement(Article.all_objects, 'favorites_count', article_ids)
+
+    def unfollow(followee_ids):
+        _decrement(Profile.objects, 'followers_count', followee_ids)
+        _decrement(
+            Profile.objects, 'following_count', [profile.pk],
+            len(followee_ids)
+        )
+
+    def remove_follower(follower_ids):
+        _decrement(Profile.objects, 'following_count', follower_ids)
+        _decrement(
+            Profile.objects, 'followers_count', [profile.pk],
+            len(follower_ids)
+        )
+
+    return sum((
+        delete_in_batches(
+            Comment.objects.filter(author_id=profile.pk), batch_size, pause
+        ),
+        delete_in_batches(
+            Favorite.objects.filter(profile_id=profile.pk), batch_size,
+            pause, 'article_id', unfavorite
+        ),
+        delete_in_batches(
+            Follow.objects.filter(from_profile_id=profile.pk), batch_size,
+            pause, 'to_profile_id', unfollow
+        ),
+        delete_in_batches(
+            Follow.objects.filter(to_profile_id=profile.pk), batch_size,
+            pause, 'from_profile_id', remove_follower
+        ),
+        delete_in_batches(
+            TimelineEntry.objects.filter(profile_id=profile.pk), batch_size,
+            pause
+        ),
+    ))
+
+
+def delete_in_batches(queryset, batch_size, pause=0, column=None,
+                      on_delete=None):
+    """
+    Delete the rows of `queryset` at most `batch_size` at a time, each
+    batch in its own transaction, sleeping `pause` seconds in between so
+    other writers get the lock. `on_delete`, if given, is called in each
+    batch's transaction with the deleted rows' values of `column`. Returns
+    the number of rows deleted.
+    """
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.values_list(
+                'pk', column or 'pk'
+            )[:batch_size])
+
+            if not rows:
+                break
+
+            queryset.model.objects.filter(
+                pk__in=[pk for pk, _ in rows]
+            ).delete()
+
+            if on_delete is not None:
+                on_delete([value for _, value in rows])
+
+        deleted += len(rows)
+        time.sleep(pause)
+
+    return deleted
+
+
+def _decrement(queryset, field, pks, amount=1):
+    # Never below 0, even if the stored count has drifted.
+    queryset.filter(pk__in=pks).update(
+        **{field: Greatest(F(field) - amount, 0)}
+    )
@@ -1,15 +1,135 @@
+import threading
+
+from django.db import IntegrityError, router, transaction
+
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
 from .models import Tag
 
+# Tags are never renamed or deleted, so a slug always maps to the same row.
+_tag_cache = {}
+_tag_cache_lock = threading.Lock()
+
+TAG_CACHE_SIZE = 10000
+
+
+def get_tags(names):
+    """
+    Return the `Tag` for every name in `names`, creating the missing ones.
+
+    Tags are looked up with one query and created with one bulk insert.
+    When another request creates some of the same tags first, the insert
+    fails on `Tag.slug` and is retried with whatever is still missing.
+
+    New tags are only cached once the caller's transaction commits, so a
+    rollback never leaves pks of rows that don't exist in the cache.
+    """
+    by_slug = {}
+
+    for name in names:
+        by_slug.setdefault(name.lower(), name)
+
+    tags = {}
+
+    for slug in by_slug:
+        tag = _tag_cache.get(slug, None)
+
+        if tag is not None:
+            tags[slug] = tag
+
+    missing = [slug for slug in by_slug if slug not in tags]
+
+    for attempt in range(3):
+        if not missing:
+            break
+
+        found = Tag.objects.filter(slug__in=missing)
+        tags.update((tag.slug, tag) for tag in found)
+        missing = [slug for slug in missing if slug not in tags]
+
+        if not missing:
+            break
+
+        try:
+            with transaction.atomic():
+                # bulk_create doesn't set primary keys on every backend, so
+                # the next pass reads the new rows back.
+                Tag.objects.bulk_create([
+                    Tag(tag=by_slug[slug], slug=slug) for slug in missing
+                ])
+        except IntegrityError:
+            pass
+    else:
+        found = Tag.objects.filter(slug__in=missing)
+        tags.update((tag.slug, tag) for tag in found)
+        missing = [slug for slug in missing if slug not in tags]
+
+        if missing:
+            raise IntegrityError(
+                'Could not create tags: {0}.'.format(', '.join(missing))
+            )
+
+    # Runs straight away outside a transaction, and never if it rolls back.
+    transaction.on_commit(
+        lambda: _cache_tags(tags), using=router.db_for_write(Tag)
+    )
+
+    return [tags[slug] for slug in by_slug]
+
+
+def clear_tag_cache():
+    with _tag_cache_lock:
+        _tag_cache.clear()
+
+
+def _cache_tags(tags):
+    with _tag_cache_lock:
+        if len(_tag_cache) + len(tags) > TAG_CACHE_SIZE:
+            _tag_cache.clear()
+
+        _tag_cache.update(tags)
+
+
+class ManyTagRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        for item in data:
+            self.child_relation.validate_name(item)
+
+        return get_tags(data)
+
+
 class TagRelatedField(serializers.RelatedField):
+    default_error_messages = {
+        'incorrect_type': 'Incorrect type. Expected a tag name, '
+                          'received {data_type}.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        # Resolve the whole tag list at once instead of tag by tag.
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyTagRelatedField(**list_kwargs)
+
     def get_queryset(self):
         return Tag.objects.all()
 
     def to_internal_value(self, data):
-        tag, created = Tag.objects.get_or_create(tag=data, slug=data.lower())
+        self.validate_name(data)
 
-        return tag
+        return get_tags([data])[0]
 
     def to_representation(self, value):
         return value.tag
+
+    def validate_name(self, data):
+        if not isinstance(data, str):
+            self.fail('incorrect_type', data_type=type(data).__name__)
@@ -7,3 +7,11 @@ class ArticleJSONRenderer(ConduitJSONRenderer):
 class CommentJSONRenderer(ConduitJSONRenderer):
     object_label = 'comment'
     object_label_plural = 'comments'
+
+class FavoriteJSONRenderer(ConduitJSONRenderer):
+    object_label = 'favorite'
+    object_label_plural = 'favorites'
+
+class TagJSONRenderer(ConduitJSONRenderer):
+    object_label = 'tag'
+    object_label_plural = 'tags'
@@ -0,0 +1,67 @@
+"""
+Rendering of `Article.body` to the HTML stored in `Article.body_html`.
+
+Bodies are rendered as Markdown and sanitized with bleach, both pinned in
+requirements.txt. An install without them escapes the body and splits it
+into paragraphs instead, which is safe to show but not rendered. The
+renderer version stored with each article says which of the two produced
+it, so `render_article_bodies` re-renders those once the packages are
+installed; bump `RENDERER_VERSION` whenever the output changes, then run
+the command.
+"""
+from django.utils.html import linebreaks
+
+try:
+    import bleach
+    import markdown
+except ImportError:
+    bleach = markdown = None
+
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ('fenced_code', 'tables')
+
+ALLOWED_TAGS = frozenset((
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre',
+    'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+))
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'abbr': ['title'],
+    'img': ['alt', 'src', 'title'],
+}
+ALLOWED_PROTOCOLS = frozenset(('http', 'https', 'mailto'))
+
+
+def get_renderer_version():
+    return '{0}:{1}'.format(
+        RENDERER_VERSION, 'text' if markdown is None else 'markdown'
+    )
+
+
+def render_body(body):
+    """Return `body` as sanitized HTML."""
+    if markdown is None:
+        return linebreaks(body, autoescape=True)
+
+    html = markdown.markdown(body, extensions=list(MARKDOWN_EXTENSIONS))
+
+    return bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True
+    )
+
+
+def get_body_html(body, body_html, body_html_version):
+    """
+    Return the stored `body_html`, or render `body` again if it was stored
+    by another renderer version and hasn't been backfilled yet.
+    """
+    if body_html_version == get_renderer_version():
+        return body_html
+
+    return render_body(body)
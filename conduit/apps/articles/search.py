@@ -0,0 +1,156 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+# FTS5 index over Article.title, description and body, created in migration
+# 0008_article_search and kept in sync by the triggers below.
+FTS_TABLE = 'articles_article_fts'
+
+# On SQLite, adding a field to Article rebuilds its table, which drops
+# these triggers; `create_triggers` puts them back.
+TRIGGERS = {
+    'articles_article_fts_insert': """
+        CREATE TRIGGER articles_article_fts_insert
+        AFTER INSERT ON articles_article BEGIN
+            INSERT INTO articles_article_fts(rowid, title, description, body)
+            VALUES (new.id, new.title, new.description, new.body);
+        END
+    """,
+    'articles_article_fts_delete': """
+        CREATE TRIGGER articles_article_fts_delete
+        AFTER DELETE ON articles_article BEGIN
+            INSERT INTO articles_article_fts(
+                articles_article_fts, rowid, title, description, body
+            )
+            VALUES ('delete', old.id, old.title, old.description, old.body);
+        END
+    """,
+    'articles_article_fts_update': """
+        CREATE TRIGGER articles_article_fts_update
+        AFTER UPDATE OF title, description, body ON articles_article BEGIN
+            INSERT INTO articles_article_fts(
+                articles_article_fts, rowid, title, description, body
+            )
+            VALUES ('delete', old.id, old.title, old.description, old.body);
+            INSERT INTO articles_article_fts(rowid, title, description, body)
+            VALUES (new.id, new.title, new.description, new.body);
+        END
+    """,
+}
+
+# bm25 weights for title, description and body.
+RANK = 'bm25({0}, 10.0, 5.0, 1.0)'.format(FTS_TABLE)
+
+_available = None
+
+
+def is_available():
+    """
+    Return True if the database has the FTS5 article index and the
+    triggers that keep it in sync.
+    """
+    global _available
+
+    if _available is None:
+        _available = (
+            connection.vendor == 'sqlite' and
+            FTS_TABLE in connection.introspection.table_names() and
+            not get_missing_triggers(connection)
+        )
+
+    return _available
+
+
+def get_missing_triggers(connection):
+    """Return the names of the index's triggers missing from `connection`."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        existing = set(row[0] for row in cursor.fetchall())
+
+    return sorted(set(TRIGGERS) - existing)
+
+
+def create_triggers(connection):
+    """
+    Create the index's missing triggers on `connection` and, if any were
+    missing, rebuild the index to catch up on the writes they missed.
+    Returns the names of the triggers created.
+    """
+    global _available
+
+    if connection.vendor != 'sqlite' or (
+        FTS_TABLE not in connection.introspection.table_names()
+    ):
+        return []
+
+    missing = get_missing_triggers(connection)
+
+    if missing:
+        with connection.cursor() as cursor:
+            for name in missing:
+                cursor.execute(TRIGGERS[name])
+
+            cursor.execute(
+                "INSERT INTO {0}({0}) VALUES ('rebuild')".format(FTS_TABLE)
+            )
+
+        _available = None
+
+    return missing
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query matching every word in it. Words are
+    quoted so FTS5 operators in user input are matched literally.
+    """
+    words = re.findall(r'\w+', text)
+
+    return ' '.join('"{0}"'.format(word) for word in words)
+
+
+def search(queryset, text):
+    """
+    Narrow the `Article` queryset to articles matching `text`, best match
+    first. Falls back to a (slow) `icontains` scan without FTS5.
+    """
+    match = build_match_query(text)
+
+    if not match:
+        return queryset.none()
+
+    if not is_available():
+        query = Q()
+
+        for word in re.findall(r'\w+', text):
+            query &= (
+                Q(title__icontains=word) |
+                Q(description__icontains=word) |
+                Q(body__icontains=word)
+            )
+
+        return queryset.filter(query)
+
+    table = queryset.model._meta.db_table
+
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            '{0}.rowid = {1}.id'.format(FTS_TABLE, table),
+            '{0} MATCH %s'.format(FTS_TABLE),
+        ],
+        params=[match],
+        select={'search_rank': RANK},
+        order_by=['search_rank', '-id'],
+    )
+
+
+def rebuild_index():
+    """Rebuild the FTS5 index from the articles table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO {0}({0}) VALUES ('rebuild')".format(FTS_TABLE)
+        )
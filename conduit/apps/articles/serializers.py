@@ -1,11 +1,34 @@
 from rest_framework import serializers
 
+from conduit.apps.core.fieldsets import SparseFieldsetMixin
+from conduit.apps.core.metrics import TimedSerializerMixin
 from conduit.apps.profiles.serializers import ProfileSerializer
+from conduit.apps.profiles.viewer import get_viewer_relations
 
+from . import rendering
 from .models import Article, Comment
 from .relations import TagRelatedField
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentListSerializer(TimedSerializerMixin,
+                            serializers.ListSerializer):
+    def to_representation(self, data):
+        comments = list(data.all() if hasattr(data, 'all') else data)
+        self.prime(comments)
+
+        return super(CommentListSerializer, self).to_representation(comments)
+
+    def prime(self, comments):
+        """Load whether the viewer follows each comment's author at once."""
+        relations = get_viewer_relations(self.context.get('request', None))
+
+        if relations is not None and 'author' in self.child.fields:
+            relations.prime(
+                profile_ids=[comment.author_id for comment in comments]
+            )
+
+class CommentSerializer(SparseFieldsetMixin,
+                        TimedSerializerMixin,
+                        serializers.ModelSerializer):
     author = ProfileSerializer(read_only=True)
 
     createdAt = serializers.SerializerMethodField(method_name='get_created_at')
@@ -20,6 +43,17 @@ class CommentSerializer(serializers.ModelSerializer):
             'createdAt',
             'updatedAt',
         )
+        list_serializer_class = CommentListSerializer
+
+    # Ordered by (created_at, id), see KeysetPagination.
+    key_columns = ('id', 'created_at')
+    sparse_columns = {
+        'author': ProfileSerializer.related_columns('author'),
+        'body': ('body',),
+        'createdAt': ('created_at',),
+        'updatedAt': ('updated_at',),
+    }
+
     def create(self, validated_data):
         article = self.context['article']
         author = self.context['author']
@@ -34,21 +68,52 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_updated_at(self, instance):
         return instance.updated_at.isoformat()
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleListSerializer(TimedSerializerMixin,
+                            serializers.ListSerializer):
+    def to_representation(self, data):
+        articles = list(data.all() if hasattr(data, 'all') else data)
+        self.prime(articles)
+
+        return super(ArticleListSerializer, self).to_representation(articles)
+
+    def prime(self, articles):
+        """
+        Load whether the viewer favorited each article and follows each
+        author with one query apiece.
+        """
+        relations = get_viewer_relations(self.context.get('request', None))
+        fields = self.child.fields
+
+        if relations is not None:
+            relations.prime(
+                profile_ids=[
+                    article.author_id for article in articles
+                ] if 'author' in fields else (),
+                article_ids=[
+                    article.pk for article in articles
+                ] if 'favorited' in fields else ()
+            )
+
+class ArticleSerializer(SparseFieldsetMixin,
+                        TimedSerializerMixin,
+                        serializers.ModelSerializer):
 
     author = ProfileSerializer(read_only=True)
     description = serializers.CharField(required=False)
     slug = serializers.SlugField(required=False)
 
-    # The name of the method if not specified as it is below for favrotesCount
-    # defaults to get_<field_name>. So here favorited --> get_favorited
+    # The name of the method if not specified defaults to
+    # get_<field_name>. So here favorited --> get_favorited
     favorited = serializers.SerializerMethodField()
-    favoritesCount = serializers.SerializerMethodField(
-        method_name='get_favorites_count'
+    favoritesCount = serializers.IntegerField(
+        source='favorites_count', read_only=True
     )
 
     tagList = TagRelatedField(many=True, required=False, source='tags')
 
+    # Only sent when asked for with ?fields=, see `optional_fields`.
+    bodyHtml = serializers.SerializerMethodField(method_name='get_body_html')
+
     createdAt = serializers.SerializerMethodField(method_name='get_created_at')
     updatedAt = serializers.SerializerMethodField(method_name='get_updated_at')
 
@@ -57,6 +122,7 @@ class ArticleSerializer(serializers.ModelSerializer):
         fields = (
             'author',
             'body',
+            'bodyHtml',
             'createdAt',
             'description',
             'favorited',
@@ -66,34 +132,48 @@ class ArticleSerializer(serializers.ModelSerializer):
             'title',
             'updatedAt',
         )
+        list_serializer_class = ArticleListSerializer
+
+    # Ordered by (created_at, id), see KeysetPagination.
+    key_columns = ('id', 'created_at')
+    optional_fields = ('bodyHtml',)
+    # `favorited` and `tagList` come from other tables.
+    sparse_columns = {
+        'author': ProfileSerializer.related_columns('author'),
+        'body': ('body',),
+        'bodyHtml': ('body', 'body_html', 'body_html_version'),
+        'createdAt': ('created_at',),
+        'description': ('description',),
+        'favoritesCount': ('favorites_count',),
+        'slug': ('slug',),
+        'title': ('title',),
+        'updatedAt': ('updated_at',),
+    }
 
     def create(self, validated_data):
         author = self.context.get('author', None)
         tags = validated_data.pop('tags', [])
 
         article = Article.objects.create(author=author, **validated_data)
-
-        for tag in tags:
-            article.tags.add(tag)
+        article.tags.add(*tags)
 
         return article
 
+    def get_body_html(self, instance):
+        return rendering.get_body_html(
+            instance.body, instance.body_html, instance.body_html_version
+        )
+
     def get_created_at(self, instance):
         return instance.created_at.isoformat()
 
     def get_favorited(self, instance):
-        request = self.context.get('request', None)
+        relations = get_viewer_relations(self.context.get('request', None))
 
-        if request is None:
+        if relations is None:
             return False
 
-        if not request.user.is_authenticated:
-            return False
-
-        return request.user.profile.has_favorited(instance)
-
-    def get_favorites_count(self, instance):
-        return instance.favorited_by.count()
+        return relations.has_favorited(instance)
 
     def get_updated_at(self, instance):
         return instance.updated_at.isoformat()
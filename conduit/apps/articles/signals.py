@@ -1,29 +1,297 @@
-from django.db.models.signals import pre_save
+from django.db import connections
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
+)
 from django.dispatch import receiver
-from django.utils.text import slugify
 
-from conduit.apps.core.utils import generate_random_string
+from conduit.apps.authentication.models import User
+from conduit.apps.profiles.models import Profile
+from conduit.apps.profiles.signals import favorite_changed
 
-from .models import Article
+from . import caching, rendering, search, tags, timelines
+from .models import Article, TimelineEntry
+from .utils import generate_article_slug
 
 @receiver(pre_save, sender=Article)
 def add_slug_to_article_if_not_exists(sender, instance, *args, **kwargs):
-    MAXIMUM_SLUG_LENGTH = 255
-
     if instance and not instance.slug:
-        slug = slugify(instance.title)
-        unique = generate_random_string()
+        instance.slug = generate_article_slug(instance.title)
+
+@receiver(pre_save, sender=Article)
+def render_article_body(sender, instance, update_fields=None, *args,
+                        **kwargs):
+    # Saves that name their fields only re-render when the body is one.
+    if update_fields is not None and 'body' not in update_fields:
+        return
+
+    instance.body_html = rendering.render_body(instance.body)
+    instance.body_html_version = rendering.get_renderer_version()
+
+@receiver(post_save, sender=Article)
+def save_rendered_article_body(sender, instance, update_fields=None, *args,
+                               **kwargs):
+    # A save naming `body` but not the HTML fields, such as saving an
+    # instance loaded with `defer('body_html')`, doesn't write what
+    # `render_article_body` rendered, so write it here.
+    if update_fields is None or 'body' not in update_fields:
+        return
+
+    if not {'body_html', 'body_html_version'} <= set(update_fields):
+        Article.all_objects.filter(pk=instance.pk).update(
+            body_html=instance.body_html,
+            body_html_version=instance.body_html_version
+        )
+
+@receiver(post_save, sender=Article)
+def add_article_to_follower_timelines(sender, instance, created, *args, **kwargs):
+    if instance and created:
+        timelines.fan_out(instance)
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def update_timelines_on_follow(sender, instance, action, reverse, pk_set,
+                               *args, **kwargs):
+    # `instance.follows` changed when `reverse` is False; otherwise it was
+    # `instance.followed_by`, and `pk_set` holds the followers.
+    if action == 'post_add':
+        if not reverse:
+            timelines.backfill(instance, pk_set)
+        else:
+            for follower in Profile.objects.filter(pk__in=pk_set):
+                timelines.backfill(follower, [instance.pk])
+
+    elif action == 'post_remove':
+        if not reverse:
+            timelines.remove(instance, pk_set)
+        else:
+            for follower in Profile.objects.filter(pk__in=pk_set):
+                timelines.remove(follower, [instance.pk])
+
+    elif action == 'post_clear':
+        if not reverse:
+            TimelineEntry.objects.filter(profile=instance).delete()
+        else:
+            TimelineEntry.objects.filter(article__author=instance).delete()
+
+@receiver(m2m_changed, sender=Profile.favorites.through)
+def update_favorites_count(sender, instance, action, reverse, pk_set,
+                           *args, **kwargs):
+    # `Profile.favorite` and `unfavorite` update the count themselves; this
+    # covers writes made through the `favorites`/`favorited_by` managers.
+    # On add `pk_set` only holds the rows that are new, but on remove it
+    # holds every requested row, so count the ones that exist beforehand.
+    if action == 'post_add':
+        if reverse:
+            _update_favorites_count([instance.pk], len(pk_set))
+        else:
+            _update_favorites_count(pk_set, 1)
+
+    elif action in ('pre_remove', 'pre_clear'):
+        if reverse:
+            favorites = sender.objects.filter(article_id=instance.pk)
+
+            if action == 'pre_remove':
+                favorites = favorites.filter(profile_id__in=pk_set)
+
+            _update_favorites_count([instance.pk], -favorites.count())
+        else:
+            favorites = sender.objects.filter(profile_id=instance.pk)
+
+            if action == 'pre_remove':
+                favorites = favorites.filter(article_id__in=pk_set)
+
+            _update_favorites_count(
+                list(favorites.values_list('article_id', flat=True)), -1
+            )
+
+def _update_favorites_count(article_ids, delta):
+    if article_ids and delta:
+        Article.objects.filter(pk__in=article_ids).update(
+            favorites_count=F('favorites_count') + delta
+        )
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def update_follow_counts(sender, instance, action, reverse, pk_set,
+                         *args, **kwargs):
+    # Without `reverse` the instance is the follower and `pk_set` holds the
+    # profiles it follows; with it, the other way round. Removals count the
+    # rows that exist beforehand, like `update_favorites_count`.
+    if reverse:
+        own_count, other_count = 'followers_count', 'following_count'
+        own_column, other_column = 'to_profile_id', 'from_profile_id'
+    else:
+        own_count, other_count = 'following_count', 'followers_count'
+        own_column, other_column = 'from_profile_id', 'to_profile_id'
+
+    if action == 'post_add':
+        other_ids, delta = list(pk_set), 1
+
+    elif action in ('pre_remove', 'pre_clear'):
+        follows = sender.objects.filter(**{own_column: instance.pk})
+
+        if action == 'pre_remove':
+            follows = follows.filter(**{other_column + '__in': pk_set})
+
+        other_ids, delta = list(
+            follows.values_list(other_column, flat=True)
+        ), -1
+
+    else:
+        return
+
+    _update_follow_count(own_count, [instance.pk], delta * len(other_ids))
+    _update_follow_count(other_count, other_ids, delta)
+
+@receiver(pre_delete, sender=Profile)
+def update_follow_counts_on_delete(sender, instance, *args, **kwargs):
+    # Deleting a profile removes its follows rows without m2m_changed.
+    Follow = Profile.follows.through
+
+    _update_follow_count('followers_count', list(Follow.objects.filter(
+        from_profile_id=instance.pk
+    ).values_list('to_profile_id', flat=True)), -1)
+    _update_follow_count('following_count', list(Follow.objects.filter(
+        to_profile_id=instance.pk
+    ).values_list('from_profile_id', flat=True)), -1)
+
+def _update_follow_count(field, profile_ids, delta):
+    if profile_ids and delta:
+        Profile.objects.filter(pk__in=profile_ids).update(
+            **{field: F(field) + delta}
+        )
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def update_articles_count(sender, instance, action, reverse, pk_set,
+                          *args, **kwargs):
+    # Same as `update_favorites_count`: `pk_set` only holds new rows on add,
+    # so removals count the rows that exist beforehand.
+    if action == 'post_add':
+        if reverse:
+            tags.update_articles_count({instance.pk: len(pk_set)})
+        else:
+            tags.update_articles_count(dict.fromkeys(pk_set, 1))
+
+    elif action in ('pre_remove', 'pre_clear'):
+        if reverse:
+            articles = sender.objects.filter(tag_id=instance.pk)
+
+            if action == 'pre_remove':
+                articles = articles.filter(article_id__in=pk_set)
+
+            tags.update_articles_count({instance.pk: -articles.count()})
+        else:
+            articles = sender.objects.filter(article_id=instance.pk)
+
+            if action == 'pre_remove':
+                articles = articles.filter(tag_id__in=pk_set)
+
+            tags.update_articles_count(dict.fromkeys(
+                articles.values_list('tag_id', flat=True), -1
+            ))
+
+@receiver(pre_delete, sender=Article)
+def update_articles_count_on_delete(sender, instance, *args, **kwargs):
+    # Deleting an article removes its tag rows without m2m_changed.
+    tags.update_articles_count(dict.fromkeys(
+        Article.tags.through.objects.filter(
+            article_id=instance.pk
+        ).values_list('tag_id', flat=True),
+        -1
+    ))
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_cached_article(sender, instance, *args, **kwargs):
+    # Cached article responses are keyed by the generations in
+    # `caching`; each receiver below bumps only what its write shows up
+    # in. Bumps wait for the commit, so doing them before a write is safe.
+    caching.invalidate_articles([instance.slug])
+
+@receiver(post_save, sender=Profile)
+def invalidate_cached_articles_by_profile(sender, instance, created,
+                                          *args, **kwargs):
+    if not created:
+        caching.invalidate_authors([instance.pk])
+
+@receiver(post_save, sender=User)
+def invalidate_cached_articles_by_user(sender, instance, created,
+                                       *args, **kwargs):
+    if not created:
+        caching.invalidate_authors(
+            Profile.objects.filter(user_id=instance.pk).values('pk')
+        )
+
+@receiver(favorite_changed, sender=Profile)
+def invalidate_cached_favorite(sender, instance, article, *args, **kwargs):
+    caching.invalidate_articles([article.slug])
+    caching.invalidate_viewers([instance.user_id])
+
+@receiver(m2m_changed, sender=Profile.favorites.through)
+def invalidate_cached_favorites(sender, instance, action, reverse, pk_set,
+                                *args, **kwargs):
+    # Without `reverse` the instance is the profile and `pk_set` holds
+    # articles; with it, the other way round. A clear has no `pk_set`, so
+    # it is read beforehand.
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        if action == 'pre_clear':
+            pk_set = sender.objects.filter(
+                article_id=instance.pk
+            ).values_list('profile_id', flat=True)
+
+        caching.invalidate_articles([instance.slug])
+        caching.invalidate_profile_viewers(pk_set)
+    else:
+        if action == 'pre_clear':
+            pk_set = sender.objects.filter(
+                profile_id=instance.pk
+            ).values_list('article_id', flat=True)
+
+        caching.invalidate_articles(Article.all_objects.filter(
+            pk__in=pk_set
+        ).values_list('slug', flat=True))
+        caching.invalidate_viewers([instance.user_id])
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def invalidate_cached_follows(sender, instance, action, reverse, pk_set,
+                              *args, **kwargs):
+    # Only the follower sees `following` change, so only its viewer
+    # generation is bumped; the lists and articles stay cached.
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        caching.invalidate_viewers([instance.user_id])
+    elif action == 'pre_clear':
+        caching.invalidate_profile_viewers(sender.objects.filter(
+            to_profile_id=instance.pk
+        ).values('from_profile_id'))
+    else:
+        caching.invalidate_profile_viewers(pk_set)
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_cached_tags(sender, instance, action, reverse, pk_set,
+                           *args, **kwargs):
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        caching.invalidate_articles([instance.slug])
+        return
 
-        if len(slug) > MAXIMUM_SLUG_LENGTH:
-            slug = slug[:MAXIMUM_SLUG_LENGTH]
+    articles = Article.all_objects.filter(tags=instance)
 
-        while len(slug + '-' + unique) > MAXIMUM_SLUG_LENGTH:
-            parts = slug.split('-')
+    if action != 'pre_clear':
+        articles = Article.all_objects.filter(pk__in=pk_set)
 
-            if len(parts) is 1:
-                # No hyphens remaining
-                slug = slug[:MAXIMUM_SLUG_LENGTH - len(unique)-1]
-            else:
-                slug = '-'.join(parts[:-1])
+    caching.invalidate_articles(articles.values_list('slug', flat=True))
 
-        instance.slug = slug + '-' + unique
+@receiver(post_migrate)
+def recreate_search_triggers(sender, using='default', *args, **kwargs):
+    # Any migration that adds a field to Article rebuilds its table on
+    # SQLite and drops the search index's triggers with it, see
+    # search.TRIGGERS. Put them back after every migrate.
+    if sender.label == 'articles':
+        search.create_triggers(connections[using])
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import Tag
+
+# (expires, limit, names) of the last popular tags lookup in this process.
+_popular_tags = None
+_popular_tags_lock = threading.Lock()
+
+
+def get_popular_tags_limit():
+    return getattr(settings, 'CONDUIT_POPULAR_TAGS_LIMIT', 20)
+
+
+def get_popular_tags(limit=None):
+    """
+    Return the names of the `limit` most used tags, most used first.
+
+    The result is kept in-process for CONDUIT_POPULAR_TAGS_TTL seconds and
+    dropped as soon as this process changes an article's tags; other
+    processes catch up when it expires.
+    """
+    global _popular_tags
+
+    if limit is None:
+        limit = get_popular_tags_limit()
+
+    cached = _popular_tags
+
+    if cached is not None:
+        expires, cached_limit, names = cached
+
+        if expires > time.monotonic() and cached_limit >= limit:
+            return names[:limit]
+
+    names = list(Tag.objects.filter(
+        articles_count__gt=0
+    ).order_by('-articles_count', 'slug').values_list('tag', flat=True)[:limit])
+
+    with _popular_tags_lock:
+        _popular_tags = (
+            time.monotonic() + getattr(settings, 'CONDUIT_POPULAR_TAGS_TTL', 10),
+            limit,
+            names
+        )
+
+    return names
+
+
+def invalidate_popular_tags():
+    global _popular_tags
+
+    with _popular_tags_lock:
+        _popular_tags = None
+
+
+def update_articles_count(counts):
+    """
+    Add `counts`, a mapping of tag id to delta, to `Tag.articles_count`,
+    with one UPDATE per distinct delta.
+    """
+    by_delta = {}
+
+    for tag_id, delta in counts.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(tag_id)
+
+    for delta, tag_ids in by_delta.items():
+        Tag.objects.filter(pk__in=tag_ids).update(
+            articles_count=F('articles_count') + delta
+        )
+
+    if by_delta:
+        invalidate_popular_tags()
@@ -0,0 +1,147 @@
+import sqlite3
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from conduit.apps.profiles.models import Profile
+
+from .models import Article, TimelineEntry
+
+Follow = Profile.follows.through
+
+# Profiles trimmed per statement, below SQLite's default limit of 999
+# query parameters.
+TRIM_BATCH_SIZE = 500
+
+# Deletes every entry of the listed profiles past the newest `length`.
+TRIM_SQL = '''
+    DELETE FROM {table} WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY profile_id ORDER BY created_at DESC, id DESC
+            ) AS position
+            FROM {table} WHERE profile_id IN ({profile_ids})
+        ) ranked WHERE position > %s
+    )
+'''
+
+
+def get_timeline_length():
+    return getattr(settings, 'CONDUIT_FEED_TIMELINE_LENGTH', 1000)
+
+
+def fan_out(article):
+    """Add `article` to the timeline of every follower of its author."""
+    fan_out_many([article])
+
+
+def fan_out_many(articles):
+    """
+    Add each of `articles` to the timelines of its author's followers and
+    return the followers' ids.
+
+    The timelines aren't trimmed: that would rank every entry of every
+    follower's timeline on each new article. They grow past
+    `CONDUIT_FEED_TIMELINE_LENGTH` until the `trim_timelines` command runs,
+    or until the caller trims the returned profiles itself.
+    """
+    followers = {}
+
+    for author_id, follower_id in Follow.objects.filter(
+        to_profile_id__in=set(article.author_id for article in articles)
+    ).values_list('to_profile_id', 'from_profile_id'):
+        followers.setdefault(author_id, []).append(follower_id)
+
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(
+            profile_id=follower_id,
+            article_id=article.pk,
+            created_at=article.created_at
+        )
+        for article in articles
+        for follower_id in followers.get(article.author_id, [])
+    ], batch_size=500)
+
+    return set(
+        follower_id
+        for follower_ids in followers.values()
+        for follower_id in follower_ids
+    )
+
+
+def backfill(profile, followee_ids):
+    """Add the latest articles of `followee_ids` to `profile`'s timeline."""
+    articles = Article.objects.filter(
+        author_id__in=followee_ids
+    ).order_by('-created_at', '-id').values_list(
+        'id', 'created_at'
+    )[:get_timeline_length()]
+
+    articles = list(articles)
+    existing = set(TimelineEntry.objects.filter(
+        profile=profile, article_id__in=[pk for pk, _ in articles]
+    ).values_list('article_id', flat=True))
+
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(
+            profile_id=profile.pk, article_id=pk, created_at=created_at
+        )
+        for pk, created_at in articles if pk not in existing
+    ], batch_size=500)
+
+    trim([profile.pk])
+
+
+def remove(profile, followee_ids):
+    """Remove the articles of `followee_ids` from `profile`'s timeline."""
+    TimelineEntry.objects.filter(
+        profile=profile, article__author_id__in=followee_ids
+    ).delete()
+
+
+def find_overfull():
+    """Return the ids of the profiles whose timelines are too long."""
+    return list(TimelineEntry.objects.order_by().values(
+        'profile_id'
+    ).annotate(
+        entries=Count('id')
+    ).filter(
+        entries__gt=get_timeline_length()
+    ).values_list('profile_id', flat=True))
+
+
+def trim(profile_ids):
+    """
+    Drop everything past the newest `CONDUIT_FEED_TIMELINE_LENGTH`, with
+    one statement per `TRIM_BATCH_SIZE` profiles.
+    """
+    length = get_timeline_length()
+    profile_ids = list(profile_ids)
+
+    if not has_window_functions():
+        for profile_id in profile_ids:
+            stale = TimelineEntry.objects.filter(
+                profile_id=profile_id
+            ).order_by('-created_at', '-id').values('id')[length:]
+
+            TimelineEntry.objects.filter(id__in=stale).delete()
+
+        return
+
+    table = connection.ops.quote_name(TimelineEntry._meta.db_table)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(profile_ids), TRIM_BATCH_SIZE):
+            batch = profile_ids[start:start + TRIM_BATCH_SIZE]
+            cursor.execute(TRIM_SQL.format(
+                table=table, profile_ids=', '.join(['%s'] * len(batch))
+            ), batch + [length])
+
+
+def has_window_functions():
+    # Django 2.0 says SQLite has none, but it does since 3.25.
+    if connection.vendor == 'sqlite':
+        return sqlite3.sqlite_version_info >= (3, 25)
+
+    return connection.features.supports_over_clause
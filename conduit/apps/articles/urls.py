@@ -3,14 +3,18 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    ArticleViewSet, ArticlesFavoriteAPIView, CommentsListCreateAPIView,
-    CommentsDestroyAPIView
+    ArticleViewSet, ArticlesFavoriteAPIView, ArticlesFeedAPIView,
+    CommentsListCreateAPIView, CommentsDestroyAPIView, TagListAPIView,
+    UserFavoritesAPIView
 )
 
 router = DefaultRouter(trailing_slash=False)
 router.register(r'articles', ArticleViewSet)
 
 urlpatterns = [
+    # Must come before the router, which would take `feed` for a slug.
+    path('articles/feed', ArticlesFeedAPIView.as_view()),
+
     path('', include(router.urls)),
 
     path('articles/<article_slug>/favorite',
@@ -21,4 +25,8 @@ urlpatterns = [
 
     path('articles/<article_slug>/comments/<comment_pk>',
         CommentsDestroyAPIView.as_view()),
+
+    path('tags', TagListAPIView.as_view()),
+
+    path('user/favorites', UserFavoritesAPIView.as_view()),
 ]
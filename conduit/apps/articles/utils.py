@@ -0,0 +1,25 @@
+from django.utils.text import slugify
+
+from conduit.apps.core.utils import generate_random_string
+
+MAXIMUM_SLUG_LENGTH = 255
+
+
+def generate_article_slug(title):
+    """Return `title` slugified, with a random suffix to keep it unique."""
+    slug = slugify(title)
+    unique = generate_random_string()
+
+    if len(slug) > MAXIMUM_SLUG_LENGTH:
+        slug = slug[:MAXIMUM_SLUG_LENGTH]
+
+    while len(slug + '-' + unique) > MAXIMUM_SLUG_LENGTH:
+        parts = slug.split('-')
+
+        if len(parts) == 1:
+            # No hyphens remaining
+            slug = slug[:MAXIMUM_SLUG_LENGTH - len(unique)-1]
+        else:
+            slug = '-'.join(parts[:-1])
+
+    return slug + '-' + unique
@@ -1,13 +1,23 @@
 from rest_framework import generics, mixins, status, viewsets
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.permissions import (
-    IsAuthenticated, IsAuthenticatedOrReadOnly
+    AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 )
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Article, Comment
-from .renderers import ArticleJSONRenderer, CommentJSONRenderer
+from conduit.apps.core.cache import CachedResponseMixin
+from conduit.apps.core.fieldsets import get_fieldset, restrict_queryset
+from conduit.apps.core.mixins import StreamingListMixin
+from conduit.apps.core.pagination import KeysetPagination, OffsetPagination
+from conduit.apps.core.views import BulkRelationAPIView
+
+from . import caching, fastpath, purge, search, tags
+from .models import Article, Comment, TimelineEntry
+from .renderers import (
+    ArticleJSONRenderer, CommentJSONRenderer, FavoriteJSONRenderer,
+    TagJSONRenderer
+)
 from .serializers import ArticleSerializer, CommentSerializer
 
 class ArticlesFavoriteAPIView(APIView):
@@ -45,7 +55,59 @@ class ArticlesFavoriteAPIView(APIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class ArticleViewSet(mixins.CreateModelMixin,
+class ArticlesFeedAPIView(StreamingListMixin, generics.ListAPIView):
+    permission_classes = (IsAuthenticated,)
+    read_from_replica = True
+    queryset = TimelineEntry.objects.all()
+    renderer_classes = (ArticleJSONRenderer,)
+    serializer_class = ArticleSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return self.queryset.filter(
+            profile=self.request.user.profile
+        ).values('id', 'article_id', 'created_at')
+
+    def list(self, request):
+        serializer_context = {'request': request}
+        page = self.paginate_queryset(self.get_queryset())
+
+        articles = self.get_articles().in_bulk(
+            [entry['article_id'] for entry in page]
+        )
+        page = [
+            articles[entry['article_id']] for entry in page
+            if entry['article_id'] in articles
+        ]
+
+        serializer = self.serializer_class(
+            page,
+            context=serializer_context,
+            many=True
+        )
+
+        return self.get_list_response(page, serializer)
+
+    def get_articles(self):
+        articles = restrict_queryset(
+            Article.objects.select_related('author', 'author__user'),
+            self.request, self.serializer_class
+        )
+        fieldset = get_fieldset(self.request, self.serializer_class)
+
+        # `bodyHtml` is only sent when asked for.
+        if fieldset is None:
+            articles = articles.defer('body_html', 'body_html_version')
+
+        if fieldset is None or 'tagList' in fieldset:
+            articles = articles.prefetch_related('tags')
+
+        return articles
+
+class ArticleViewSet(CachedResponseMixin,
+                        StreamingListMixin,
+                        mixins.CreateModelMixin,
+                        mixins.DestroyModelMixin,
                         mixins.ListModelMixin,
                         mixins.RetrieveModelMixin,
                         viewsets.GenericViewSet):
@@ -53,8 +115,38 @@ class ArticleViewSet(mixins.CreateModelMixin,
     lookup_field = 'slug'
     queryset = Article.objects.select_related('author','author__user')
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    read_from_replica = True
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
+    pagination_class = KeysetPagination
+    cache_namespace = caching.LIST_NAMESPACE
+
+    @property
+    def paginator(self):
+        # Search results are ordered by rank, which keyset pagination
+        # can't page through, so they are paged by offset instead.
+        if not hasattr(self, '_paginator'):
+            if 'search' in self.request.query_params:
+                self._paginator = OffsetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_cache_namespaces(self, request):
+        # A single article doesn't change with the lists, and what the
+        # viewer favorites and follows only matters to the viewer.
+        if self.action == 'retrieve':
+            namespaces = (
+                caching.ARTICLES_NAMESPACE,
+                caching.get_article_namespace(self.kwargs['slug']),
+            )
+        else:
+            namespaces = (caching.LIST_NAMESPACE,)
+
+        if request.user.is_authenticated:
+            namespaces += (caching.get_viewer_namespace(request.user.pk),)
+
+        return namespaces
 
     def create(self, request):
         serializer_context = {
@@ -70,22 +162,109 @@ class ArticleViewSet(mixins.CreateModelMixin,
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def destroy(self, request, slug):
+        try:
+            article = Article.objects.get(slug=slug)
+        except Article.DoesNotExist:
+            raise NotFound('An article with this slug does not exist.')
+
+        if article.author_id != request.user.profile.pk:
+            raise PermissionDenied('Only the author can delete an article.')
+
+        # Its comments and favorites are deleted later by `purge_hidden`.
+        purge.hide_article(article)
+
+        return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+    def filter_queryset(self, queryset):
+        # Each filter is a join on an indexed column: Tag.slug,
+        # User.username, or the favorites table's (profile, article) key.
+        tag = self.request.query_params.get('tag', None)
+        author = self.request.query_params.get('author', None)
+        favorited = self.request.query_params.get('favorited', None)
+        text = self.request.query_params.get('search', None)
+
+        if tag is not None:
+            queryset = queryset.filter(tags__slug=tag.lower())
+
+        if author is not None:
+            queryset = queryset.filter(author__user__username=author)
+
+        if favorited is not None:
+            queryset = queryset.filter(favorited_by__user__username=favorited)
+
+        if text is not None:
+            queryset = search.search(queryset, text)
+
+        return queryset
+
+    def get_queryset(self):
+        queryset = restrict_queryset(
+            self.queryset, self.request, self.serializer_class
+        )
+        fieldset = get_fieldset(self.request, self.serializer_class)
+
+        # `bodyHtml` is only sent when asked for.
+        if fieldset is None:
+            queryset = queryset.defer('body_html', 'body_html_version')
+
+        # Resolve tags for every article up front instead of once per
+        # article in the serializer.
+        if fieldset is None or 'tagList' in fieldset:
+            queryset = queryset.prefetch_related('tags')
+
+        return queryset
+
     def list(self, request):
+        cached_response = self.get_cached_response(request)
+
+        if cached_response is not None:
+            return cached_response
+
+        if fastpath.is_enabled():
+            fieldset = get_fieldset(request, self.serializer_class)
+            page = self.paginate_queryset(fastpath.values(
+                self.filter_queryset(Article.objects.all()), fieldset
+            ))
+
+            return self.get_paginated_response(
+                fastpath.represent(page, request, fieldset)
+            )
+
         serializer_context = {'request': request}
-        serializer_instances = self.queryset.all()
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
 
         serializer = self.serializer_class(
-            serializer_instances,
+            page,
             context=serializer_context,
             many=True
         )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_list_response(page, serializer)
 
     def retrieve(self, request, slug):
+        cached_response = self.get_cached_response(request)
+
+        if cached_response is not None:
+            return cached_response
+
+        if fastpath.is_enabled():
+            fieldset = get_fieldset(request, self.serializer_class)
+            rows = fastpath.values(
+                Article.objects.filter(slug=slug), fieldset
+            )
+            data = fastpath.represent(rows, request, fieldset)
+
+            if not data:
+                raise NotFound('An article with this slug does not exist')
+
+            return Response(data[0], status=status.HTTP_200_OK)
+
         serializer_context = {'request': request}
         try:
-            serializer_instance = self.queryset.get(slug=slug)
+            serializer_instance = self.get_queryset().get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound('An article with this slug does not exist')
 
@@ -118,22 +297,44 @@ class ArticleViewSet(mixins.CreateModelMixin,
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class CommentsListCreateAPIView(generics.ListCreateAPIView):
+class CommentsListCreateAPIView(StreamingListMixin,
+                                generics.ListCreateAPIView):
     lookup_field = 'article__slug'
     lookup_url_kwarg = 'article_slug'
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    queryset = Comment.objects.select_related(
-        'article', 'article__author', 'article__author__user',
-        'author', 'author__user'
-    )
-
+    # CommentSerializer only shows the comment's author.
+    queryset = Comment.objects.select_related('author', 'author__user')
+    read_from_replica = True
     renderer_classes = (CommentJSONRenderer,)
     serializer_class = CommentSerializer
+    pagination_class = KeysetPagination
 
     def filter_queryset(self, queryset):
         filters = {self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
 
-        return queryset.filter(**filters)
+        # Until `purge_hidden` deletes them, leave out the comments of
+        # hidden articles and deactivated authors.
+        return queryset.filter(
+            article__hidden_at__isnull=True,
+            author__user__is_active=True,
+            **filters
+        )
+
+    def get_queryset(self):
+        return restrict_queryset(
+            self.queryset, self.request, self.serializer_class
+        )
+
+    def list(self, request, article_slug=None):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+
+        if page is None:
+            page = queryset
+
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_list_response(page, serializer)
 
     def create(self, request, article_slug=None):
         data = request.data.get('comment', {})
@@ -164,3 +365,20 @@ class CommentsDestroyAPIView(generics.DestroyAPIView):
         comment.delete()
 
         return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+
+class TagListAPIView(APIView):
+    permission_classes = (AllowAny,)
+    read_from_replica = True
+    renderer_classes = (TagJSONRenderer,)
+
+    def get(self, request):
+        return Response(tags.get_popular_tags(), status=status.HTTP_200_OK)
+
+
+class UserFavoritesAPIView(BulkRelationAPIView):
+    queryset = Article.objects.all()
+    renderer_classes = (FavoriteJSONRenderer,)
+    items_label = 'favorites'
+    lookup_field = 'slug'
+    relation = 'favorites'
@@ -1,12 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
 
 from django.conf import settings
 
 from rest_framework import authentication, exceptions
 
+from conduit.apps.core import dbrouters
+
 from .models import User
 
 
+class TokenCache(object):
+    """
+    Bounded LRU of tokens that passed `jwt.decode`, mapped to their payload.
+
+    Only tokens that verified are ever stored, and an entry is dropped as
+    soon as the token's `exp` passes, so a hit is as good as decoding the
+    token again.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            payload = self._entries.get(token, None)
+
+            if payload is None:
+                return None
+
+            if payload.get('exp', 0) <= time.time():
+                del self._entries[token]
+                return None
+
+            self._entries.move_to_end(token)
+
+            return payload
+
+    def set(self, token, payload):
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class UserCache(object):
+    """
+    Short-lived cache of active users by id.
+
+    Field values are stored rather than instances, so every request gets
+    its own `User` and nothing cached on it leaks between requests. Entries
+    are invalidated by `post_save` on `User` in this process; other
+    processes see the change within `ttl` seconds.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        entry = self._entries.get(user_id, None)
+
+        if entry is None:
+            return None
+
+        expires_at, db, values = entry
+
+        if expires_at <= time.monotonic():
+            self.invalidate(user_id)
+            return None
+
+        field_names = [field.attname for field in User._meta.concrete_fields]
+
+        return User.from_db(db, field_names, values)
+
+    def set(self, user):
+        values = [
+            getattr(user, field.attname)
+            for field in User._meta.concrete_fields
+        ]
+
+        with self._lock:
+            self._entries[user.pk] = (
+                time.monotonic() + self.ttl, user._state.db, values
+            )
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(getattr(settings, 'CONDUIT_JWT_CACHE_SIZE', 1024))
+user_cache = UserCache(getattr(settings, 'CONDUIT_USER_CACHE_TTL', 30))
+
+
 class JWTAuthentication(authentication.BaseAuthentication):
     authentication_header_prefix = 'Token'
 
@@ -65,20 +168,33 @@ class JWTAuthentication(authentication.BaseAuthentication):
         else throw an error.
         """
 
-        try:
-            payload = jwt.decode(token, settings.SECRET_KEY)
-        except:
-            msg = 'Invalid authentication. Could not decode token'
-            raise exceptions.AuthenticationFailed(msg)
-
-        try:
-            user = User.objects.get(pk=payload['id'])
-        except User.DoesNotExist:
-            msg = 'No user matching this token was found'
-            raise exceptions.AuthenticationFailed(msg)
-
-        if not user.is_active:
-            msg = 'This user has been deactivated'
-            raise exception.AuthenticationFailed(msg)
+        payload = token_cache.get(token)
+
+        if payload is None:
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY)
+            except:
+                msg = 'Invalid authentication. Could not decode token'
+                raise exceptions.AuthenticationFailed(msg)
+
+            token_cache.set(token, payload)
+
+        user = user_cache.get(payload['id'])
+
+        if user is None:
+            try:
+                # Always the primary, so a user can't be missing or stale
+                # because of replication lag.
+                with dbrouters.primary():
+                    user = User.objects.get(pk=payload['id'])
+            except User.DoesNotExist:
+                msg = 'No user matching this token was found'
+                raise exceptions.AuthenticationFailed(msg)
+
+            if not user.is_active:
+                msg = 'This user has been deactivated'
+                raise exceptions.AuthenticationFailed(msg)
+
+            user_cache.set(user)
 
         return (user, token)
@@ -4,6 +4,9 @@ class UserJSONRenderer(ConduitJSONRenderer):
     object_label='user'
 
     def render(self, data, media_type=None, renderer_context=None):
+        # e.g. the empty body of deactivating the user
+        if data is None:
+            return super(UserJSONRenderer, self).render(data)
 
         #Byte objects don't serialize well, so we decode token
         token = data.get('token', None)
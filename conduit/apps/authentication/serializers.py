@@ -2,10 +2,12 @@ from django.contrib.auth import authenticate
 
 from rest_framework import serializers
 
+from conduit.apps.core.metrics import TimedSerializerMixin
 from conduit.apps.profiles.serializers import ProfileSerializer
 from .models import User
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
     """Serializers, registration requests and creates a new user"""
 
     # Ensure passwords are 8-128 and can't be read by client
@@ -27,7 +29,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         return User.objects.create_user(**validated_data)
 
-class LoginSerializer(serializers.Serializer):
+class LoginSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.CharField(max_length=255)
     username = serializers.CharField(max_length=255, read_only=True)
     password = serializers.CharField(max_length=128, write_only=True)
@@ -76,7 +78,7 @@ class LoginSerializer(serializers.Serializer):
             'token': user.token
         }
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Handles serialization and deserialization of User objects."""
 
     # passwords between 8 - 128 characters
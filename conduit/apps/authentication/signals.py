@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from conduit.apps.profiles.models import Profile
 
+from .backends import user_cache
 from .models import User
 
 @receiver(post_save, sender=User)
@@ -10,3 +11,9 @@ def create_related_profile(sender, instance, created, *args, **kwargs):
     # Only create profile first time
     if instance and created:
         instance.profile = Profile.objects.create(user=instance)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, *args, **kwargs):
+    # JWTAuthentication must not hand out a stale or deactivated user.
+    user_cache.invalidate(instance.pk)
@@ -1,15 +1,18 @@
 from rest_framework import status
-from rest_framework.generics import RetrieveUpdateAPIView
+from rest_framework.generics import RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from conduit.apps.articles import purge
+from conduit.apps.core.throttling import EmailThrottle, IPThrottle
+
 from .renderers import UserJSONRenderer
 from .serializers import (
     LoginSerializer, RegistrationSerializer, UserSerializer,
 )
 
-class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
+class UserRetrieveUpdateAPIView(RetrieveUpdateDestroyAPIView):
     permission_classes = (IsAuthenticated, )
     renderer_classes = (UserJSONRenderer, )
     serializer_class = UserSerializer
@@ -44,12 +47,25 @@ class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def destroy(self, request, *args, **kwargs):
+        # Deactivates rather than deletes; the user's articles are hidden
+        # now, and `purge_hidden` deletes them and the user's comments and
+        # favorites later.
+        purge.deactivate_profile(request.user.profile)
+
+        return Response(None, status=status.HTTP_204_NO_CONTENT)
+
 class RegistrationAPIView(APIView):
     #Allow user to hit this endpoint regardless
     #of authenticaiton
     permission_classes = (AllowAny,)
     serializer_class = RegistrationSerializer
     renderer_classes = (UserJSONRenderer, )
+    # Hashing the password is slow on purpose, so limit how often one
+    # client can make us do it.
+    throttle_classes = (IPThrottle, EmailThrottle)
+    throttle_scope = 'registration'
+
     def post(self, request):
         user = request.data.get('user', {})
 
@@ -64,6 +80,8 @@ class LoginAPIView(APIView):
     permission_classes = (AllowAny,)
     serializer_class = LoginSerializer
     renderer_classes = (UserJSONRenderer, )
+    throttle_classes = (IPThrottle, EmailThrottle)
+    throttle_scope = 'login'
 
     def post(self, request):
         user = request.data.get('user', {})
@@ -0,0 +1,256 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from rest_framework.response import Response
+
+from . import compression, dbrouters
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'CONDUIT_RESPONSE_CACHE', 'default')]
+
+
+def _generation_key(namespace):
+    # Namespaces can hold parts of URLs, which aren't all valid in keys.
+    return 'conduit:generation:{0}'.format(
+        hashlib.md5(namespace.encode('utf-8')).hexdigest()
+    )
+
+
+def get_generation(namespace):
+    """
+    Return the current generation of `namespace`. Cached responses are keyed
+    by it, so bumping the generation invalidates all of them at once.
+    """
+    return get_generations([namespace])[0]
+
+
+def get_generations(namespaces):
+    """Return the current generation of each of `namespaces`, in order."""
+    cache = get_response_cache()
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    generations = cache.get_many(keys)
+
+    for key in keys:
+        if key not in generations:
+            # Start from the clock so an evicted counter never comes back
+            # with a value that was already used.
+            cache.add(key, int(time.time() * 1000), None)
+            generations[key] = cache.get(key)
+
+    return [generations[key] for key in keys]
+
+
+def bump_generation(*namespaces):
+    """
+    Bump the generation of each of `namespaces` once the current transaction
+    commits, or now outside one. Bumping earlier would let a concurrent read
+    cache what it read before the commit under the new generation.
+    """
+    if namespaces:
+        transaction.on_commit(lambda: _bump_generations(namespaces))
+
+
+def _bump_generations(namespaces):
+    cache = get_response_cache()
+
+    for namespace in set(namespaces):
+        try:
+            cache.incr(_generation_key(namespace))
+        except ValueError:
+            get_generation(namespace)
+
+
+class CachedResponseMixin(object):
+    """
+    Conditional GETs and a shared cache of anonymous responses.
+
+    Successful GETs of the `cached_actions` get a strong ETag made from the
+    current generations of the namespaces `get_cache_namespaces` returns,
+    the URL, the media type and the requesting user. Views pick namespaces
+    that every write to what the response shows bumps, e.g. one per
+    article and one for the viewer's own favorites and follows, so the
+    generations validate the whole response; `updated_at` and
+    `favorites_count` alone would miss its author, tags and viewer state.
+    They also need no query, so views call `get_cached_response` first and
+    If-None-Match is answered with `304 Not Modified` before the ORM and
+    the serializers run, for authenticated requests too.
+
+    Responses that get an ETag are read from the primary, never from the
+    replica, which may not have caught up with the generation yet.
+
+    Anonymous responses are also stored in the response cache under those
+    generations, and served from it. Each entry keeps the body compressed
+    in every encoding it has been requested in, so popular responses are
+    compressed once rather than on every hit.
+    """
+    cache_namespace = None
+    cached_actions = ('list', 'retrieve')
+
+    def get_cache_namespaces(self, request):
+        """
+        Return the namespaces whose generations the response to `request`
+        depends on, `cache_namespace` alone by default.
+        """
+        return (self.cache_namespace,)
+
+    def get_cached_response(self, request):
+        self._etag = None
+
+        if not self._has_etag(request):
+            return None
+
+        # The response is labelled with the generation read below, so it
+        # is built from the primary, where every write that generation
+        # covers is visible. A lagging replica could have it cached and
+        # answered with 304s under that generation until the next bump.
+        # Cache hits and 304s don't query at all.
+        dbrouters.use_replica(False)
+
+        # Remember the key so the response is labelled and stored under the
+        # generations it was built from, even if a write bumps them
+        # meanwhile.
+        self._cache_key = self._get_cache_key(request)
+        self._etag = self._get_etag(request)
+
+        # `*` only matches once the resource is known to exist, which
+        # finalize_response checks.
+        if self._etag_matches(request, self._etag, wildcard=False):
+            return self._not_modified()
+
+        if not self._is_cacheable(request):
+            return None
+
+        cached = get_response_cache().get(self._cache_key)
+
+        if cached is None:
+            return None
+
+        content_type, variants = cached
+        response = HttpResponse(content_type=content_type)
+        response['ETag'] = self._etag
+        encoding = self._get_encoding(request, variants)
+
+        if encoding is not None and encoding not in variants:
+            # Compress a popular response once, not on every hit.
+            variants[encoding] = compression.compress(variants[None], encoding)
+            self._store(content_type, variants)
+
+        compression.set_encoded_content(response, variants[encoding], encoding)
+        patch_vary_headers(response, ('Authorization', 'Accept-Encoding'))
+
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(CachedResponseMixin, self).finalize_response(
+            request, response, *args, **kwargs
+        )
+
+        if request.method not in ('GET', 'HEAD'):
+            return response
+
+        patch_vary_headers(response, ('Authorization',))
+
+        if (getattr(self, '_etag', None) is None or
+                not isinstance(response, Response) or
+                response.status_code != 200):
+            return response
+
+        response.render()
+        response['ETag'] = self._etag
+
+        if self._is_cacheable(request):
+            # Store the body compressed the way this request wants it next
+            # to the uncompressed one, and send that.
+            variants = {None: response.content}
+            encoding = self._get_encoding(request, variants)
+
+            if encoding is not None:
+                variants[encoding] = compression.compress(
+                    response.content, encoding
+                )
+                compression.set_encoded_content(
+                    response, variants[encoding], encoding
+                )
+                patch_vary_headers(response, ('Accept-Encoding',))
+
+            self._store(response['Content-Type'], variants)
+
+        if self._etag_matches(request, self._etag):
+            return self._not_modified()
+
+        return response
+
+    def _get_encoding(self, request, variants):
+        if len(variants[None]) < compression.get_min_size():
+            return None
+
+        return compression.negotiate(request)
+
+    def _store(self, content_type, variants):
+        get_response_cache().set(
+            self._cache_key,
+            (content_type, variants),
+            getattr(settings, 'CONDUIT_RESPONSE_CACHE_TIMEOUT', 60)
+        )
+
+    def _not_modified(self):
+        response = HttpResponseNotModified()
+        response['ETag'] = self._etag
+        patch_vary_headers(response, ('Authorization', 'Accept-Encoding'))
+
+        return response
+
+    def _etag_matches(self, request, etag, wildcard=True):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', None)
+
+        if not if_none_match:
+            return False
+
+        # Compressed responses carry the weak form of the same ETag.
+        etags = [tag[2:] if tag.startswith('W/') else tag
+                 for tag in parse_etags(if_none_match)]
+
+        return (wildcard and '*' in etags) or etag in etags
+
+    def _get_cache_key(self, request):
+        namespaces = self.get_cache_namespaces(request)
+        generations = get_generations(namespaces)
+
+        return 'conduit:response:{0}'.format(hashlib.md5('{0}|{1}|{2}'.format(
+            ','.join(
+                '{0}={1}'.format(namespace, generation)
+                for namespace, generation in zip(namespaces, generations)
+            ),
+            request.accepted_media_type,
+            request.get_full_path()
+        ).encode('utf-8')).hexdigest())
+
+    def _get_etag(self, request):
+        # The cache key covers the generations, URL and media type; the
+        # user is added because authenticated responses depend on them.
+        viewer = request.user.pk if request.user.is_authenticated else ''
+
+        return '"{0}"'.format(hashlib.md5(
+            '{0}:{1}'.format(self._cache_key, viewer).encode('utf-8')
+        ).hexdigest())
+
+    def _has_etag(self, request):
+        return (
+            self.cache_namespace is not None and
+            request.method in ('GET', 'HEAD') and
+            getattr(self, 'action', None) in self.cached_actions
+        )
+
+    def _is_cacheable(self, request):
+        return (
+            getattr(self, '_etag', None) is not None and
+            not request.user.is_authenticated
+        )
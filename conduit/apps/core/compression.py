@@ -0,0 +1,129 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_accept_encoding_re = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q=([0-9.]+))?')
+
+
+def get_min_size():
+    return getattr(settings, 'CONDUIT_COMPRESSION_MIN_SIZE', 1024)
+
+
+def get_encodings():
+    """Encodings we can produce, most preferred first."""
+    if brotli is not None:
+        return ('br', 'gzip')
+
+    return ('gzip',)
+
+
+def negotiate(request, encodings=None):
+    """
+    Return the preferred encoding in `encodings` that the request's
+    Accept-Encoding allows, or None.
+    """
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+    if not header:
+        return None
+
+    accepted = {}
+
+    for name, quality in _accept_encoding_re.findall(header):
+        try:
+            accepted[name.lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+
+    for encoding in encodings or get_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0))
+
+        if quality > 0:
+            return encoding
+
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(
+            content, quality=getattr(settings, 'CONDUIT_BROTLI_QUALITY', 5)
+        )
+
+    return gzip.compress(
+        content, compresslevel=getattr(settings, 'CONDUIT_GZIP_LEVEL', 6)
+    )
+
+
+def set_encoded_content(response, content, encoding):
+    """
+    Replace the body of `response` with `content` in `encoding`, which may
+    be None for the uncompressed body.
+    """
+    response.content = content
+    response['Content-Length'] = str(len(content))
+
+    if encoding is None:
+        return
+
+    response['Content-Encoding'] = encoding
+
+    # The ETag describes the uncompressed body, so it's only a weak
+    # validator of the compressed one, like GZipMiddleware does.
+    etag = response.get('ETag', None)
+
+    if etag and not etag.startswith('W/'):
+        response['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware(object):
+    """
+    Compress responses of at least CONDUIT_COMPRESSION_MIN_SIZE bytes with
+    brotli, when it's installed, or gzip, as Accept-Encoding allows.
+
+    Responses that already have a Content-Encoding, e.g. precompressed
+    ones from the response cache, are left alone. Streaming responses are
+    only ever gzipped.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding'):
+            return response
+
+        if response.streaming:
+            encoding = negotiate(request, ('gzip',))
+        elif len(response.content) >= get_min_size():
+            encoding = negotiate(request)
+        else:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+            response['Content-Encoding'] = encoding
+        else:
+            set_encoded_content(
+                response, compress(response.content, encoding), encoding
+            )
+
+        return response
@@ -0,0 +1,89 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Whether reads in the current thread may go to the replica. Set per request
+# by ReplicaRoutingMiddleware.
+_state = threading.local()
+
+
+def get_replica_alias():
+    """Return the replica's database alias, or None if there isn't one."""
+    alias = getattr(settings, 'CONDUIT_REPLICA_ALIAS', 'replica')
+
+    return alias if alias in settings.DATABASES else None
+
+
+def use_replica(enabled):
+    _state.use_replica = enabled
+
+
+@contextmanager
+def primary():
+    """Send every read made in the block to the primary."""
+    depth = getattr(_state, 'primary_depth', 0)
+    _state.primary_depth = depth + 1
+
+    try:
+        yield
+    finally:
+        _state.primary_depth = depth
+
+
+@contextmanager
+def outer_transaction():
+    """
+    Route reads in the block as if the transaction open on the primary when
+    it starts weren't there, while transactions opened inside the block
+    still keep reads on the primary. For the benchmark, which runs every
+    request inside one transaction that it rolls back.
+    """
+    previous = getattr(_state, 'outer_depth', 0)
+    _state.outer_depth = _transaction_depth(connections[DEFAULT_DB_ALIAS])
+
+    try:
+        yield
+    finally:
+        _state.outer_depth = previous
+
+
+def _transaction_depth(connection):
+    # Every atomic block nested in the outermost one adds a savepoint id,
+    # None if it didn't create a savepoint.
+    if not connection.in_atomic_block:
+        return 0
+
+    return len(connection.savepoint_ids) + 1
+
+
+class ReplicaRouter(object):
+    """
+    Send reads to the replica while `use_replica(True)` is in effect for the
+    current thread, and everything else to the primary (`default`).
+
+    Reads inside a transaction on the primary stay there, so they see the
+    writes made in it.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, 'use_replica', False):
+            return DEFAULT_DB_ALIAS
+
+        if getattr(_state, 'primary_depth', 0):
+            return DEFAULT_DB_ALIAS
+
+        if _transaction_depth(connections[DEFAULT_DB_ALIAS]) > getattr(
+            _state, 'outer_depth', 0
+        ):
+            return DEFAULT_DB_ALIAS
+
+        return get_replica_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
@@ -0,0 +1,144 @@
+from rest_framework.exceptions import ValidationError
+
+
+def get_fieldset(request, serializer_class):
+    """
+    Return the fields of `serializer_class` that a GET `request` asks for
+    with `?fields=` or `?exclude=` (comma-separated), in the serializer's
+    order, or None when it asks for the default fields. The serializer's
+    `optional_fields` are only included when named in `?fields=`. Asking
+    for no fields at all is an error.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+
+    fields = request.query_params.get('fields', None)
+    exclude = request.query_params.get('exclude', None)
+
+    if fields is None and exclude is None:
+        return None
+
+    available = serializer_class.Meta.fields
+
+    param = 'exclude' if fields is None else 'fields'
+    fields = _parse('fields', fields, available)
+    exclude = _parse('exclude', exclude, available)
+
+    if fields is None:
+        fields = get_default_fields(serializer_class)
+
+    fieldset = tuple(
+        name for name in available
+        if name in fields and name not in exclude
+    )
+
+    if not fieldset:
+        raise ValidationError({param: 'No fields left to return.'})
+
+    return fieldset
+
+
+def get_default_fields(serializer_class):
+    optional = getattr(serializer_class, 'optional_fields', ())
+
+    return tuple(
+        name for name in serializer_class.Meta.fields if name not in optional
+    )
+
+
+def _parse(param, value, available):
+    if value is None:
+        return None if param == 'fields' else set()
+
+    names = set(name.strip() for name in value.split(',') if name.strip())
+    unknown = names - set(available)
+
+    if unknown:
+        raise ValidationError({param: 'Unknown field(s): {0}.'.format(
+            ', '.join(sorted(unknown))
+        )})
+
+    return names
+
+
+def get_columns(serializer_class, fieldset):
+    """
+    Return the model columns needed to serialize `fieldset`, according to
+    the serializer's `sparse_columns`, always including its `key_columns`.
+    """
+    columns = list(serializer_class.key_columns)
+
+    for name in fieldset:
+        for column in serializer_class.sparse_columns.get(name, ()):
+            if column not in columns:
+                columns.append(column)
+
+    return columns
+
+
+def restrict_queryset(queryset, request, serializer_class):
+    """
+    Trim `queryset` to the columns needed for the request's fieldset, or
+    return it unchanged when the request doesn't ask for one.
+    """
+    fieldset = get_fieldset(request, serializer_class)
+
+    if fieldset is None:
+        return queryset
+
+    return select_columns(queryset, get_columns(serializer_class, fieldset))
+
+
+def select_columns(queryset, columns):
+    """
+    Load only `columns` from `queryset` and select_related exactly the
+    relations they go through, e.g. `author` and `author__user` for
+    `author__user__username`.
+    """
+    related = []
+
+    for column in columns:
+        parts = column.split('__')[:-1]
+
+        for i in range(1, len(parts) + 1):
+            path = '__'.join(parts[:i])
+
+            if path not in related:
+                related.append(path)
+
+    queryset = queryset.select_related(None)
+
+    if related:
+        queryset = queryset.select_related(*related)
+
+    return queryset.only(*(columns + related))
+
+
+class SparseFieldsetMixin(object):
+    """
+    Serializer mixin that drops the fields left out by the request's
+    fieldset, see `get_fieldset`. Only applies to serializers created with
+    the request in their context, so nested serializers keep every field.
+
+    `sparse_columns` maps each field to the model columns it reads, for
+    views that trim their queries to match with `select_columns`.
+    `optional_fields` are left out unless the request asks for them.
+    """
+    key_columns = ('id',)
+    optional_fields = ()
+    sparse_columns = {}
+
+    def __init__(self, *args, **kwargs):
+        super(SparseFieldsetMixin, self).__init__(*args, **kwargs)
+
+        fieldset = get_fieldset(
+            self.context.get('request', None), self.__class__
+        )
+
+        if fieldset is None and self.optional_fields:
+            fieldset = get_default_fields(self.__class__)
+
+        if fieldset is not None:
+            for name in list(self.fields):
+                if name not in fieldset:
+                    self.fields.pop(name)
@@ -0,0 +1,428 @@
+import json
+import math
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import (
+    override_settings, setup_test_environment, teardown_test_environment
+)
+
+from conduit.apps.articles.models import Article, Tag
+from conduit.apps.articles.relations import clear_tag_cache
+from conduit.apps.articles.tags import invalidate_popular_tags
+from conduit.apps.authentication.models import User
+from conduit.apps.core import dbrouters
+from conduit.apps.core.cache import get_response_cache
+from conduit.apps.core.metrics import RequestMetrics
+from conduit.apps.core.utils import generate_random_string
+from conduit.apps.profiles.models import Profile
+
+# How many usernames and slugs the bulk follow and favorite requests name.
+BULK_ITEMS = 20
+
+# Every route in conduit/urls.py except the admin and DELETE /api/user,
+# which would deactivate the benchmark's user, in the order they run in
+# each iteration. Paths and bodies are %-formatted with the fixtures set up
+# by `Command.set_up`, plus `n`, the iteration number, and whatever earlier
+# requests captured.
+#
+# (name, method, path, body, authenticated, expected status, query budget)
+ENDPOINTS = (
+    ('users.register', 'post', '/api/users', {'user': {
+        'username': '%(run)s-%(n)s',
+        'email': '%(run)s-%(n)s@example.com',
+        'password': 'password',
+    }}, False, 201, 4),
+    ('users.login', 'post', '/api/users/login', {'user': {
+        'email': '%(email)s', 'password': 'password',
+    }}, False, 200, 1),
+    ('user.retrieve', 'get', '/api/user', None, True, 200, 1),
+    ('user.update', 'put', '/api/user', {'user': {
+        'bio': 'Benchmark iteration %(n)s.',
+    }}, True, 200, 7),
+    ('profiles.retrieve', 'get', '/api/profiles/%(username)s', None,
+     False, 200, 1),
+    ('profiles.retrieve (authenticated)', 'get',
+     '/api/profiles/%(username)s', None, True, 200, 4),
+    ('profiles.follow', 'post', '/api/profiles/%(username)s/follow', {},
+     True, 201, 14),
+    ('profiles.unfollow', 'delete', '/api/profiles/%(username)s/follow',
+     None, True, 200, 11),
+    ('profiles.followers', 'get', '/api/profiles/%(username)s/followers',
+     None, False, 200, 3),
+    ('profiles.followers (authenticated)', 'get',
+     '/api/profiles/%(username)s/followers', None, True, 200, 5),
+    ('profiles.following', 'get', '/api/profiles/%(username)s/following',
+     None, False, 200, 3),
+    ('user.follows', 'post', '/api/user/follows', {'follows': [
+        '%(bulk_username_{0})s'.format(i) for i in range(BULK_ITEMS)
+    ]}, True, 200, 13),
+    ('user.unfollows', 'delete', '/api/user/follows', {'follows': [
+        '%(bulk_username_{0})s'.format(i) for i in range(BULK_ITEMS)
+    ]}, True, 200, 11),
+    ('articles.list', 'get', '/api/articles', None, False, 200, 2),
+    ('articles.list (authenticated)', 'get', '/api/articles', None,
+     True, 200, 5),
+    ('articles.list (next page)', 'get',
+     '/api/articles?cursor=%(cursor)s', None, False, 200, 2),
+    ('articles.list (tag)', 'get', '/api/articles?tag=%(tag)s', None,
+     False, 200, 2),
+    ('articles.list (author)', 'get', '/api/articles?author=%(username)s',
+     None, False, 200, 2),
+    ('articles.list (favorited)', 'get',
+     '/api/articles?favorited=%(username)s', None, False, 200, 2),
+    ('articles.list (search)', 'get', '/api/articles?search=%(word)s',
+     None, False, 200, 3),
+    ('articles.feed', 'get', '/api/articles/feed', None, True, 200, 6),
+    ('articles.create', 'post', '/api/articles', {'article': {
+        'title': 'Benchmark %(n)s',
+        'description': 'Written by the benchmark.',
+        'body': 'Benchmark article %(n)s.',
+        'tagList': ['%(tag)s', 'benchmark'],
+    }}, True, 201, 10),
+    ('articles.retrieve', 'get', '/api/articles/%(slug)s', None,
+     False, 200, 2),
+    ('articles.retrieve (authenticated)', 'get', '/api/articles/%(slug)s',
+     None, True, 200, 5),
+    ('articles.update', 'put', '/api/articles/%(own_slug)s', {'article': {
+        'body': 'Updated in iteration %(n)s.',
+    }}, True, 200, 6),
+    ('articles.destroy', 'delete', '/api/articles/%(created_slug)s', None,
+     True, 204, 9),
+    ('articles.favorite', 'post', '/api/articles/%(slug)s/favorite', {},
+     True, 201, 12),
+    ('articles.unfavorite', 'delete', '/api/articles/%(slug)s/favorite',
+     None, True, 200, 13),
+    ('user.favorites', 'post', '/api/user/favorites', {'favorites': [
+        '%(bulk_slug_{0})s'.format(i) for i in range(BULK_ITEMS)
+    ]}, True, 200, 9),
+    ('user.unfavorites', 'delete', '/api/user/favorites', {'favorites': [
+        '%(bulk_slug_{0})s'.format(i) for i in range(BULK_ITEMS)
+    ]}, True, 200, 10),
+    ('comments.list', 'get', '/api/articles/%(slug)s/comments', None,
+     False, 200, 1),
+    ('comments.list (authenticated)', 'get',
+     '/api/articles/%(slug)s/comments', None, True, 200, 2),
+    ('comments.create', 'post', '/api/articles/%(slug)s/comments',
+     {'comment': {'body': 'Benchmark comment %(n)s.'}}, True, 201, 3),
+    ('comments.destroy', 'delete',
+     '/api/articles/%(slug)s/comments/%(comment)s', None, True, 204, 2),
+    ('tags.list', 'get', '/api/tags', None, False, 200, 1),
+    ('metrics', 'get', '/metrics', None, False, 200, 0),
+)
+
+# Values later requests use, taken from earlier responses:
+# endpoint name -> (fixture, path to the value in the response body).
+CAPTURES = {
+    'articles.list': ('cursor', ('nextCursor',)),
+    'articles.create': ('created_slug', ('article', 'slug')),
+    'comments.create': ('comment', ('comment', 'id')),
+}
+
+# Responses that must list something, or the endpoint is broken however fast
+# it is: endpoint name -> key of the list in the response body.
+NON_EMPTY = {
+    'articles.list': 'articles',
+    'articles.list (next page)': 'articles',
+    'articles.list (tag)': 'articles',
+    'articles.list (search)': 'articles',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Call every API route through the test client against the current '
+        'database, report latency percentiles and query counts, and fail '
+        'when an endpoint makes more queries than its budget. Run seed_data '
+        'first. Everything the benchmark writes is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument(
+            '--warmup', type=int, default=1,
+            help='Iterations run before measuring, e.g. to fill the JWT '
+                 'and tag caches.'
+        )
+        parser.add_argument(
+            '--endpoint', action='append', default=[],
+            help='Only run endpoints whose name starts with this; may be '
+                 'repeated.'
+        )
+        parser.add_argument(
+            '--warm-cache', action='store_true',
+            help='Keep the response cache between requests instead of '
+                 'measuring every request against a cold cache.'
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options['endpoint'] or any(
+                endpoint[0].startswith(prefix)
+                for prefix in options['endpoint']
+            )
+        ]
+
+        if not endpoints:
+            raise CommandError('No endpoint matches --endpoint.')
+
+        self.warm_cache = options['warm_cache']
+        self.client = Client()
+
+        # Lets the test client through ALLOWED_HOSTS.
+        setup_test_environment()
+
+        try:
+            # The benchmark registers and logs in far more often than the
+            # throttles allow. Everything runs in one transaction that is
+            # rolled back; reads still go where they would outside it.
+            with override_settings(CONDUIT_THROTTLE_RATES={}), \
+                    mirror_replica(), transaction.atomic(), \
+                    dbrouters.outer_transaction():
+                fixtures = self.set_up()
+                results = self.run(
+                    endpoints, fixtures,
+                    options['warmup'], options['iterations']
+                )
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+            get_response_cache().clear()
+            invalidate_popular_tags()
+            # Tags the run created are gone with the rollback.
+            clear_tag_cache()
+
+        self.report(endpoints, results)
+
+    def set_up(self):
+        article = Article.objects.order_by('-favorites_count', '-id').first()
+
+        if article is None:
+            raise CommandError(
+                'There are no articles to benchmark; run seed_data first.'
+            )
+
+        author = Profile.objects.annotate(
+            followers=Count('followed_by')
+        ).order_by('-followers', '-id').select_related('user').first()
+        tag = Tag.objects.order_by('-articles_count', 'slug').first()
+
+        run = 'benchmark-{0}'.format(generate_random_string())
+        user = User.objects.create_user(
+            run, '{0}@example.com'.format(run), 'password'
+        )
+
+        # A realistic feed, and an article of its own to update.
+        user.profile.follows.add(*Profile.objects.annotate(
+            followers=Count('followed_by')
+        ).order_by('-followers').values_list('pk', flat=True)[:20])
+
+        own_article = Article.objects.create(
+            title=run, description='', body='', author=user.profile
+        )
+
+        fixtures = {
+            'run': run,
+            'email': user.email,
+            'token': user.token,
+            'slug': article.slug,
+            'own_slug': own_article.slug,
+            'username': author.user.username,
+            'tag': tag.tag if tag is not None else 'benchmark',
+            'word': article.title.split()[0],
+            'cursor': '',
+            'created_slug': '',
+            'comment': 0,
+        }
+
+        # Profiles the user doesn't follow yet and articles it hasn't
+        # favorited, for the bulk requests. Small databases are padded out
+        # with names that don't exist.
+        for i in range(BULK_ITEMS):
+            fixtures['bulk_username_{0}'.format(i)] = '{0}-{1}'.format(run, i)
+            fixtures['bulk_slug_{0}'.format(i)] = '{0}-{1}'.format(run, i)
+
+        bulk_usernames = Profile.objects.exclude(
+            followed_by=user.profile
+        ).exclude(pk=user.profile.pk).order_by(
+            '-followers_count', '-id'
+        ).values_list('user__username', flat=True)[:BULK_ITEMS]
+        bulk_slugs = Article.objects.order_by(
+            '-favorites_count', '-id'
+        ).values_list('slug', flat=True)[:BULK_ITEMS]
+
+        for i, username in enumerate(bulk_usernames):
+            fixtures['bulk_username_{0}'.format(i)] = username
+
+        for i, slug in enumerate(bulk_slugs):
+            fixtures['bulk_slug_{0}'.format(i)] = slug
+
+        return fixtures
+
+    def run(self, endpoints, fixtures, warmup, iterations):
+        results = dict((endpoint[0], []) for endpoint in endpoints)
+
+        for n in range(warmup + iterations):
+            fixtures['n'] = n
+
+            for endpoint in endpoints:
+                result = self.call(endpoint, fixtures)
+
+                if n >= warmup:
+                    results[endpoint[0]].append(result)
+
+        return results
+
+    def call(self, endpoint, fixtures):
+        name, method, path, body, authenticated, expected, _ = endpoint
+
+        extra = {}
+
+        if authenticated:
+            extra['HTTP_AUTHORIZATION'] = 'Token {0}'.format(
+                fixtures['token']
+            )
+
+        if body is not None:
+            extra['data'] = json.dumps(body) % fixtures
+            extra['content_type'] = 'application/json'
+
+        if not self.warm_cache:
+            get_response_cache().clear()
+            invalidate_popular_tags()
+
+        # Read-your-writes cookies would keep reads off the replica.
+        self.client.cookies.clear()
+
+        counter = RequestMetrics()
+
+        with ExitStack() as stack:
+            for connection in get_connections():
+                stack.enter_context(connection.execute_wrapper(
+                    counter.execute_wrapper
+                ))
+
+            started = time.perf_counter()
+            response = getattr(self.client, method)(path % fixtures, **extra)
+
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.content
+
+            # The transaction never commits, so run what the request left
+            # for after the commit (cache invalidation, filling the tag
+            # cache) as a commit right after it would.
+            for connection in get_connections():
+                callbacks = connection.run_on_commit
+                connection.run_on_commit = []
+
+                for _, callback in callbacks:
+                    callback()
+
+            elapsed = time.perf_counter() - started
+
+        if response.status_code != expected:
+            raise CommandError(
+                '{0} returned {1}, expected {2}: {3}'.format(
+                    name, response.status_code, expected, content[:500]
+                )
+            )
+
+        if name in CAPTURES:
+            fixture, keys = CAPTURES[name]
+            value = json.loads(content.decode('utf-8'))
+
+            for key in keys:
+                value = value[key]
+
+            fixtures[fixture] = value or ''
+
+        if name in NON_EMPTY and not json.loads(
+            content.decode('utf-8')
+        )[NON_EMPTY[name]]:
+            raise CommandError('{0} returned no {1}: {2}'.format(
+                name, NON_EMPTY[name], content[:500]
+            ))
+
+        return elapsed, counter.db_count
+
+    def report(self, endpoints, results):
+        self.stdout.write('{0:<36} {1:>8} {2:>8} {3:>8} {4:>8} {5:>7}'.format(
+            'endpoint', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'budget'
+        ))
+
+        over_budget = []
+
+        for name, _, _, _, _, _, budget in endpoints:
+            timings = sorted(elapsed * 1000 for elapsed, _ in results[name])
+            queries = max(count for _, count in results[name])
+
+            self.stdout.write(
+                '{0:<36} {1:>8.1f} {2:>8.1f} {3:>8.1f} {4:>8} {5:>7}'.format(
+                    name,
+                    percentile(timings, 50),
+                    percentile(timings, 95),
+                    percentile(timings, 99),
+                    queries,
+                    budget
+                )
+            )
+
+            if queries > budget:
+                over_budget.append(
+                    '{0} ({1} > {2})'.format(name, queries, budget)
+                )
+
+        if over_budget:
+            raise CommandError(
+                'Over the query budget: {0}'.format(', '.join(over_budget))
+            )
+
+
+@contextmanager
+def mirror_replica():
+    """
+    Make the replica alias use the primary's connection in the block, the
+    way Django's test runner treats a TEST MIRROR, so reads routed to the
+    replica see the benchmark's uncommitted writes.
+    """
+    alias = dbrouters.get_replica_alias()
+
+    if alias is None:
+        yield
+        return
+
+    replica = connections[alias]
+    connections[alias] = connections[DEFAULT_DB_ALIAS]
+
+    try:
+        yield
+    finally:
+        connections[alias] = replica
+
+
+def get_connections():
+    """Every open connection once, though several aliases may share one."""
+    unique = []
+
+    for connection in connections.all():
+        if not any(connection is seen for seen in unique):
+            unique.append(connection)
+
+    return unique
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of the sorted `values`."""
+    if not values:
+        return 0.0
+
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+
+    return values[max(rank, 1) - 1]
@@ -0,0 +1,255 @@
+import random
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from conduit.apps.articles import bulk, caching
+from conduit.apps.articles.models import Article, Comment
+from conduit.apps.articles.relations import get_tags
+from conduit.apps.authentication.models import User
+from conduit.apps.profiles.models import Profile
+
+WORDS = (
+    'async', 'benchmark', 'cache', 'django', 'design', 'feed', 'index',
+    'latency', 'model', 'python', 'query', 'react', 'replica', 'scale',
+    'search', 'server', 'shard', 'stream', 'testing', 'throughput', 'web',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a reproducible dataset: users with profiles, a power-law '
+        'follow graph, articles with tags, favorites and comments. The '
+        'same --seed always generates the same data. Every user has the '
+        'password "password".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--articles', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument(
+            '--follows', type=int, default=20,
+            help='Average number of profiles each user follows.'
+        )
+        parser.add_argument('--favorites', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=30000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--prefix', default='seed',
+            help='Prefix of the generated usernames and slugs.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+
+        if User.objects.filter(
+            username__startswith='{0}-'.format(self.prefix)
+        ).exists():
+            raise CommandError(
+                'Users prefixed "{0}-" already exist; pick another '
+                '--prefix.'.format(self.prefix)
+            )
+
+        with transaction.atomic():
+            profiles = self.create_users(options['users'])
+
+            # Zipf weights, so a few profiles get most of the followers and
+            # write most of the articles, and a few articles get most of the
+            # favorites and comments.
+            weights = self.zipf_weights(len(profiles))
+
+            follows = self.create_follows(
+                profiles, weights, options['follows']
+            )
+            articles = self.create_articles(
+                profiles, weights, options['articles'], options['tags']
+            )
+            favorites = self.create_favorites(
+                profiles, articles, options['favorites']
+            )
+            comments = self.create_comments(
+                profiles, weights, articles, options['comments']
+            )
+
+        caching.invalidate_all_articles()
+
+        self.stdout.write(
+            'Created {0} users, {1} follows, {2} articles, {3} favorites '
+            'and {4} comments.'.format(
+                len(profiles), follows, len(articles), favorites, comments
+            )
+        )
+
+    def zipf_weights(self, n, exponent=1.1):
+        return [1.0 / (rank + 1) ** exponent for rank in range(n)]
+
+    def sample(self, population, weights, k):
+        return self.rng.choices(population, weights=weights, k=k)
+
+    def create_users(self, count):
+        # Hashing is slow on purpose; every user shares one hash.
+        password = make_password('password')
+        usernames = [
+            '{0}-user-{1}'.format(self.prefix, i) for i in range(count)
+        ]
+
+        User.objects.bulk_create([
+            User(
+                username=username,
+                email='{0}@example.com'.format(username),
+                password=password
+            )
+            for username in usernames
+        ])
+
+        # bulk_create sends no post_save, so the profiles are created here.
+        user_ids = dict(User.objects.filter(
+            username__in=usernames
+        ).values_list('username', 'pk'))
+
+        Profile.objects.bulk_create([
+            Profile(
+                user_id=user_ids[username],
+                bio='Bio of {0}.'.format(username)
+            )
+            for username in usernames
+        ])
+
+        profile_ids = dict(Profile.objects.filter(
+            user__username__in=usernames
+        ).values_list('user__username', 'pk'))
+
+        return [profile_ids[username] for username in usernames]
+
+    def create_follows(self, profiles, weights, average):
+        Follow = Profile.follows.through
+        pairs = set()
+
+        for follower in profiles:
+            for followee in self.sample(profiles, weights, average):
+                if followee != follower:
+                    pairs.add((follower, followee))
+
+        Follow.objects.bulk_create([
+            Follow(from_profile_id=follower, to_profile_id=followee)
+            for follower, followee in sorted(pairs)
+        ])
+
+        # bulk_create sends no m2m_changed, which keeps the counts.
+        self.add_to_counts(Profile, 'following_count', Counter(
+            follower for follower, _ in pairs
+        ))
+        self.add_to_counts(Profile, 'followers_count', Counter(
+            followee for _, followee in pairs
+        ))
+
+        return len(pairs)
+
+    def create_articles(self, profiles, weights, count, tag_count):
+        tag_names = [
+            '{0}{1}'.format(self.rng.choice(WORDS), i)
+            for i in range(tag_count)
+        ]
+        tags = get_tags(tag_names)
+        tag_weights = self.zipf_weights(len(tags))
+
+        authors = self.sample(profiles, weights, count)
+        article_ids = []
+
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            articles = [
+                Article(
+                    slug='{0}-article-{1}'.format(self.prefix, i),
+                    title=self.sentence(4, 10).title(),
+                    description=self.sentence(8, 20),
+                    body=self.paragraphs(),
+                    author_id=authors[i]
+                )
+                for i in range(start, stop)
+            ]
+
+            bulk.create_articles(articles, [
+                self.sample(tags, tag_weights, self.rng.randint(0, 5))
+                for _ in articles
+            ])
+
+            article_ids.extend(article.pk for article in articles)
+
+        return article_ids
+
+    def create_favorites(self, profiles, articles, count):
+        Favorite = Profile.favorites.through
+        weights = self.zipf_weights(len(articles), exponent=0.9)
+        # The most favorited articles are spread over time, not the oldest.
+        ranked = list(articles)
+        self.rng.shuffle(ranked)
+
+        pairs = set(zip(
+            [self.rng.choice(profiles) for _ in range(count)],
+            self.sample(ranked, weights, count)
+        ))
+
+        Favorite.objects.bulk_create([
+            Favorite(profile_id=profile, article_id=article)
+            for profile, article in sorted(pairs)
+        ])
+
+        self.add_to_counts(Article, 'favorites_count', Counter(
+            article for _, article in pairs
+        ))
+
+        return len(pairs)
+
+    def add_to_counts(self, model, field, counts):
+        """
+        Add `counts`, a mapping of pk to amount, to `field` of `model`, with
+        one UPDATE per distinct amount like `Tag.articles_count`.
+        """
+        by_count = {}
+
+        for pk, count in counts.items():
+            by_count.setdefault(count, []).append(pk)
+
+        for count, pks in by_count.items():
+            for start in range(0, len(pks), self.batch_size):
+                model.objects.filter(
+                    pk__in=pks[start:start + self.batch_size]
+                ).update(**{field: F(field) + count})
+
+    def create_comments(self, profiles, weights, articles, count):
+        article_weights = self.zipf_weights(len(articles), exponent=0.9)
+        ranked = list(articles)
+        self.rng.shuffle(ranked)
+
+        authors = self.sample(profiles, weights, count)
+        targets = self.sample(ranked, article_weights, count)
+
+        Comment.objects.bulk_create([
+            Comment(
+                body=self.sentence(5, 40),
+                article_id=article,
+                author_id=author
+            )
+            for author, article in zip(authors, targets)
+        ])
+
+        return count
+
+    def sentence(self, shortest, longest):
+        words = self.rng.choices(WORDS, k=self.rng.randint(shortest, longest))
+
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraphs(self):
+        return '\n\n'.join(
+            ' '.join(self.sentence(5, 15) for _ in range(self.rng.randint(2, 6)))
+            for _ in range(self.rng.randint(1, 5))
+        )
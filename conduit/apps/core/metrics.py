@@ -0,0 +1,196 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds of the histogram buckets, in seconds and in queries.
+DURATION_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+HISTOGRAMS = (
+    # (metric name, RequestMetrics attribute, buckets, help)
+    ('conduit_request_duration_seconds', 'total', DURATION_BUCKETS,
+     'Time spent handling the request.'),
+    ('conduit_db_queries', 'db_count', QUERY_COUNT_BUCKETS,
+     'Database queries made while handling the request.'),
+    ('conduit_db_duration_seconds', 'db_time', DURATION_BUCKETS,
+     'Time spent in database queries.'),
+    ('conduit_serializer_duration_seconds', 'serializer_time',
+     DURATION_BUCKETS, 'Time spent serializing response data.'),
+    ('conduit_render_duration_seconds', 'render_time', DURATION_BUCKETS,
+     'Time spent rendering response bodies.'),
+)
+
+_local = threading.local()
+
+
+class RequestMetrics(object):
+    """What handling one request cost, collected while it runs."""
+
+    def __init__(self):
+        self.view = None
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.db_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        # Depth of nested `timed` blocks per attribute, so a serializer
+        # that serializes another one isn't counted twice.
+        self._depth = {}
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Count and time queries; see `connection.execute_wrapper`."""
+        started = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_count += 1
+            self.db_time += time.perf_counter() - started
+
+    def server_timing(self):
+        return ', '.join([
+            'db;dur={0:.1f};desc="{1} queries"'.format(
+                self.db_time * 1000, self.db_count
+            ),
+            'serialize;dur={0:.1f}'.format(self.serializer_time * 1000),
+            'render;dur={0:.1f}'.format(self.render_time * 1000),
+            'total;dur={0:.1f}'.format(self.total * 1000),
+        ])
+
+
+def start_request():
+    _local.metrics = RequestMetrics()
+
+    return _local.metrics
+
+
+def end_request():
+    _local.metrics = None
+
+
+def get_request_metrics():
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def timed(attribute):
+    """Add the time spent in the block to `attribute` of this request."""
+    metrics = get_request_metrics()
+
+    if metrics is None or metrics._depth.get(attribute, 0):
+        yield
+        return
+
+    metrics._depth[attribute] = 1
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        metrics._depth[attribute] = 0
+        setattr(
+            metrics, attribute,
+            getattr(metrics, attribute) + time.perf_counter() - started
+        )
+
+
+class Histogram(object):
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One cumulative counter per bucket, plus +Inf.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.counts[-1] += 1
+        self.sum += value
+
+
+class Registry(object):
+    """
+    Histograms of `HISTOGRAMS` per view, for this process. Each process
+    serves its own /metrics, so scrape every one of them.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, metrics):
+        with self._lock:
+            for name, attribute, buckets, _ in HISTOGRAMS:
+                histogram = self._histograms.get((name, metrics.view), None)
+
+                if histogram is None:
+                    histogram = Histogram(buckets)
+                    self._histograms[(name, metrics.view)] = histogram
+
+                histogram.observe(getattr(metrics, attribute))
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """Return the histograms in the Prometheus text format."""
+        lines = []
+
+        with self._lock:
+            for name, _, buckets, help_text in HISTOGRAMS:
+                lines.append('# HELP {0} {1}'.format(name, help_text))
+                lines.append('# TYPE {0} histogram'.format(name))
+
+                views = sorted(
+                    view for (metric, view) in self._histograms
+                    if metric == name
+                )
+
+                for view in views:
+                    histogram = self._histograms[(name, view)]
+                    label = 'view="{0}"'.format(_escape(view))
+                    bounds = [
+                        _format_number(bound) for bound in buckets
+                    ] + ['+Inf']
+
+                    for bound, count in zip(bounds, histogram.counts):
+                        lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                            name, label, bound, count
+                        ))
+
+                    lines.append('{0}_sum{{{1}}} {2}'.format(
+                        name, label, _format_number(histogram.sum)
+                    ))
+                    lines.append('{0}_count{{{1}}} {2}'.format(
+                        name, label, histogram.counts[-1]
+                    ))
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class TimedSerializerMixin(object):
+    """Count the time spent building `data` as serializer time."""
+
+    @property
+    def data(self):
+        with timed('serializer_time'):
+            return super(TimedSerializerMixin, self).data
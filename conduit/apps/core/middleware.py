@@ -0,0 +1,165 @@
+import hashlib
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import get_response_cache
+from . import dbrouters, metrics
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+STICKY_COOKIE_NAME = 'conduit_primary'
+
+
+class ReplicaRoutingMiddleware(object):
+    """
+    Route the reads of safe requests to views with `read_from_replica = True`
+    to the replica database.
+
+    After a successful write the client reads from the primary for
+    CONDUIT_REPLICA_STICKY_SECONDS, so it sees its own writes whatever the
+    replication lag. The window is remembered in a cookie, and in the
+    response cache under the request's Authorization header for clients
+    that don't keep cookies.
+
+    Views can still send reads back to the primary with
+    `dbrouters.use_replica(False)`; CachedResponseMixin does for the
+    responses it labels with an ETag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            dbrouters.use_replica(False)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.stick_to_primary(request, response)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # DRF's as_view() keeps a reference to the view class.
+        view_class = getattr(view_func, 'cls', None)
+
+        if (
+            request.method in SAFE_METHODS and
+            getattr(view_class, 'read_from_replica', False) and
+            dbrouters.get_replica_alias() is not None and
+            not self.is_sticky(request)
+        ):
+            dbrouters.use_replica(True)
+
+        return None
+
+    def get_sticky_seconds(self):
+        return getattr(settings, 'CONDUIT_REPLICA_STICKY_SECONDS', 10)
+
+    def is_sticky(self, request):
+        try:
+            until = float(request.COOKIES.get(STICKY_COOKIE_NAME, 0))
+        except ValueError:
+            until = 0
+
+        if until > time.time():
+            return True
+
+        key = self._get_cache_key(request)
+
+        return key is not None and get_response_cache().get(key) is not None
+
+    def stick_to_primary(self, request, response):
+        seconds = self.get_sticky_seconds()
+
+        if not seconds:
+            return
+
+        response.set_cookie(
+            STICKY_COOKIE_NAME, str(int(time.time() + seconds)),
+            max_age=seconds, httponly=True
+        )
+
+        key = self._get_cache_key(request)
+
+        if key is not None:
+            get_response_cache().set(key, True, seconds)
+
+    def _get_cache_key(self, request):
+        authorization = request.META.get('HTTP_AUTHORIZATION', '')
+
+        if not authorization:
+            return None
+
+        return 'conduit:primary:{0}'.format(
+            hashlib.md5(authorization.encode('utf-8')).hexdigest()
+        )
+
+
+class InstrumentationMiddleware(object):
+    """
+    Measure every request to a resolved view: queries and time spent in the
+    database, serializers and renderers, and in total. The numbers go out
+    in a `Server-Timing` header and into the per-view histograms served at
+    /metrics.
+
+    Views are named after their class, plus the action for viewsets, e.g.
+    `ArticleViewSet.list`. Work done while a streaming response is being
+    sent happens after the request is recorded and isn't counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'CONDUIT_INSTRUMENTATION', True):
+            return self.get_response(request)
+
+        request_metrics = metrics.start_request()
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(
+                        request_metrics.execute_wrapper
+                    ))
+
+                response = self.get_response(request)
+        finally:
+            metrics.end_request()
+
+        request_metrics.finish()
+
+        if request_metrics.view is not None:
+            metrics.registry.observe(request_metrics)
+            response['Server-Timing'] = request_metrics.server_timing()
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request_metrics = metrics.get_request_metrics()
+
+        if request_metrics is not None:
+            request_metrics.view = self.get_view_name(request, view_func)
+
+        return None
+
+    def get_view_name(self, request, view_func):
+        view_class = getattr(view_func, 'cls', None)
+
+        if view_class is None:
+            return '{0}.{1}'.format(view_func.__module__, view_func.__name__)
+
+        # Viewsets map each method to an action.
+        actions = getattr(view_func, 'actions', None)
+
+        if actions and request.method.lower() in actions:
+            return '{0}.{1}'.format(
+                view_class.__name__, actions[request.method.lower()]
+            )
+
+        return view_class.__name__
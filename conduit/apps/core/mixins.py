@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from rest_framework.response import Response
+
+
+class StreamingListMixin(object):
+    """
+    Send list pages of at least `CONDUIT_STREAMING_MIN_ITEMS` items as a
+    `StreamingHttpResponse` when `CONDUIT_STREAMING_RESPONSES` is on.
+
+    Items are serialized and encoded one at a time while the response is
+    being sent, so neither the serialized list nor the rendered body is
+    ever held in memory as a whole.
+    """
+
+    def get_list_response(self, page, serializer):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+
+        if not self.should_stream(page, renderer):
+            if self.paginator is None:
+                return Response(serializer.data)
+
+            return self.get_paginated_response(serializer.data)
+
+        items = self.iter_representation(page, serializer)
+
+        if self.paginator is None:
+            data = items
+        else:
+            data = self.get_paginated_response(items).data
+
+        content_type = '{0}; charset={1}'.format(
+            renderer.media_type, renderer.charset
+        )
+
+        return StreamingHttpResponse(
+            renderer.render_stream(data), content_type=content_type
+        )
+
+    def iter_representation(self, page, serializer):
+        # Let the list serializer batch-load whatever it would have loaded
+        # before serializing the page in one go.
+        prime = getattr(serializer, 'prime', None)
+
+        if prime is not None:
+            prime(page)
+
+        for instance in page:
+            yield serializer.child.to_representation(instance)
+
+    def should_stream(self, page, renderer):
+        if not getattr(settings, 'CONDUIT_STREAMING_RESPONSES', False):
+            return False
+
+        if not hasattr(renderer, 'render_stream'):
+            return False
+
+        min_items = getattr(settings, 'CONDUIT_STREAMING_MIN_ITEMS', 50)
+
+        return len(page) >= min_items
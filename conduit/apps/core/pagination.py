@@ -0,0 +1,147 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a fixed, unique ordering.
+
+    The cursor holds the ordering values of the last row on the page, so
+    fetching the next page is a single range scan over an index matching
+    `ordering` no matter how deep the client has paged. `offset` is still
+    accepted for clients that follow the spec, but costs a scan over every
+    skipped row.
+    """
+    # The last field must be unique so rows with equal timestamps are
+    # never skipped or repeated between pages.
+    ordering = ('-created_at', '-id')
+
+    default_limit = 20
+    max_limit = 100
+
+    limit_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    offset_query_param = 'offset'
+
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        self.count = None
+        self.next_cursor = None
+
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        offset = request.query_params.get(self.offset_query_param)
+
+        if cursor:
+            try:
+                queryset = queryset.filter(self.decode_cursor(cursor))
+            except (TypeError, ValidationError, ValueError):
+                # The cursor decoded but holds values of the wrong type.
+                raise NotFound(self.invalid_cursor_message)
+        elif offset is not None:
+            # Offset pagination reports the total like the spec asks for.
+            offset = max(0, self._parse_int(offset, default=0))
+            self.count = queryset.count()
+            queryset = queryset[offset:]
+
+        # Fetch one extra row to find out whether there is a next page.
+        results = list(queryset[:self.limit + 1])
+
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = self.encode_cursor(results[-1])
+
+        return results
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([('results', data)])
+
+        if self.count is not None:
+            response['count'] = self.count
+
+        response['next_cursor'] = self.next_cursor
+
+        return Response(response)
+
+    def get_limit(self, request):
+        limit = self._parse_int(
+            request.query_params.get(self.limit_query_param),
+            default=self.default_limit
+        )
+
+        return max(1, min(limit, self.max_limit))
+
+    def encode_cursor(self, instance):
+        values = []
+
+        for field in self.ordering:
+            value = self._get_value(instance, field.lstrip('-'))
+
+            if isinstance(value, datetime):
+                value = value.isoformat()
+
+            values.append(value)
+
+        cursor = json.dumps(values, separators=(',', ':')).encode('utf-8')
+
+        return base64.urlsafe_b64encode(cursor).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        """
+        Turn `cursor` into the filter selecting every row after it, e.g.
+        `created_at < c OR (created_at = c AND id < i)`.
+        """
+        try:
+            values = json.loads(
+                base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            )
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        keyset = Q()
+        equal = {}
+
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+
+            keyset |= Q(**dict(equal, **{'%s__%s' % (name, lookup): value}))
+            equal[name] = value
+
+        return keyset
+
+    def _get_value(self, instance, name):
+        if isinstance(instance, dict):
+            return instance[name]
+
+        return getattr(instance, name)
+
+    def _parse_int(self, value, default):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+
+class OffsetPagination(LimitOffsetPagination):
+    """
+    limit/offset pagination for querysets that keep their own ordering,
+    such as search results ranked by relevance.
+    """
+    default_limit = KeysetPagination.default_limit
+    max_limit = KeysetPagination.max_limit
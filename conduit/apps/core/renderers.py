@@ -1,31 +1,150 @@
-import json
+
+from django.conf import settings
+from django.utils.module_loading import import_string
 
 from rest_framework.renderers import JSONRenderer
-from rest_framework.utils.serializer_helpers import ReturnList
+from rest_framework.utils import encoders
+
+from . import metrics
+
+
+def _orjson_backend():
+    import orjson
+
+    default = encoders.JSONEncoder().default
+    # Hand datetimes to DRF's encoder so output matches the stdlib backend.
+    option = orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(data):
+        return orjson.dumps(data, default=default, option=option)
+
+    return dumps
+
+
+JSON_BACKENDS = {
+    'orjson': _orjson_backend,
+}
+
+_json_backend = None
+
+
+def get_json_backend():
+    """
+    Return the callable `CONDUIT_JSON_BACKEND` names for encoding data to
+    JSON bytes, or None to use the stdlib encoder.
+
+    The setting is either a key of `JSON_BACKENDS` or the dotted path to a
+    callable returning such an encoder. Backends that can't be imported
+    fall back to the stdlib.
+    """
+    global _json_backend
+
+    if _json_backend is None:
+        name = getattr(settings, 'CONDUIT_JSON_BACKEND', None)
+        factory = JSON_BACKENDS.get(name, name)
+
+        try:
+            if isinstance(factory, str):
+                factory = import_string(factory)
+
+            _json_backend = factory() if factory else False
+        except ImportError:
+            _json_backend = False
+
+    return _json_backend or None
+
+
 class ConduitJSONRenderer(JSONRenderer):
     charset='utf-8'
     object_label = 'object'
     object_label_plural = 'objects'
 
+    # Streamed responses are flushed in chunks of about this many bytes.
+    stream_chunk_size = 64 * 1024
+
     def render(self, data, media_type=None, renderer_context=None):
-        # if data is a member of ReturnList
-        if isinstance(data, ReturnList):
-            _data = json.loads(
-                super(ConduitJSONRenderer, self).render(data).decode('utf-8')
+        if data is None:
+            return b''
+
+        with metrics.timed('render_time'):
+            return self.encode(
+                self.get_envelope(data), media_type, renderer_context
             )
 
-            return json.dumps({
-                self.object_label_plural: _data
-            })
-        else:
-            errors = data.get('errors', None)
+    def render_stream(self, data):
+        """
+        Render `data` like `render` but as an iterator of byte chunks,
+        encoding the items of the list one at a time. `data` may hold a
+        generator of items, so the whole list never has to be in memory.
+        """
+        envelope = self.get_envelope(data)
+        keys = iter(envelope)
+        list_key = next(keys)
+
+        buffer = [b'{', self.encode(list_key), b':[']
+        size = 0
+
+        for index, item in enumerate(envelope[list_key]):
+            chunk = self.encode(item)
+
+            if index:
+                buffer.append(b',')
+
+            buffer.append(chunk)
+            size += len(chunk)
+
+            if size >= self.stream_chunk_size:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+
+        buffer.append(b']')
+
+        for key in keys:
+            buffer.extend([
+                b',', self.encode(key), b':', self.encode(envelope[key])
+            ])
+
+        buffer.append(b'}')
+
+        yield b''.join(buffer)
+
+    def encode(self, data, media_type=None, renderer_context=None):
+        if data is None:
+            # JSONRenderer renders None as an empty body
+            return b'null'
+
+        backend = get_json_backend()
+
+        if backend is None or self.get_indent(media_type, renderer_context or {}):
+            # let default JSONRenderer handle
+            return super(ConduitJSONRenderer, self).render(
+                data, media_type, renderer_context
+            )
+
+        return backend(data)
+
+    def get_envelope(self, data):
+        # lists (or item generators, when streaming) are wrapped in the
+        # plural label, e.g. {"articles": [...]}
+        if not isinstance(data, dict):
+            return {self.object_label_plural: data}
+
+        if data.get('errors', None) is not None:
+            return data
+
+        if 'results' in data:
+            # paginated list, see conduit.apps.core.pagination
+            return self._paginated_envelope(data)
+
+        return {self.object_label: data}
 
-            if errors is not None:
+    def _paginated_envelope(self, data):
+        envelope = {self.object_label_plural: data['results']}
 
-                # let default JSONRenderer handle
+        if 'count' in data:
+            envelope[self.object_label_plural + 'Count'] = data['count']
 
-                return super(ConduitJSONRenderer, self).render(data)
+        envelope['nextCursor'] = data.get('next_cursor', None)
 
-            return json.dumps({
-                self.object_label: data
-            })
+        return envelope
@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Turn a rate like '5/min' into the capacity and refill rate (in tokens
+    per second) of a bucket that allows bursts of 5 and 5 per minute after
+    that. Returns None for None.
+    """
+    if rate is None:
+        return None
+
+    count, period = rate.split('/')
+    count = int(count)
+
+    return count, count / float(PERIODS[period[0]])
+
+
+class LocalBucketStore(object):
+    """
+    Token buckets in this process's memory. The least recently used
+    buckets are dropped past `maxsize`; a dropped bucket comes back full.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, wait = _take(tokens, updated, now, capacity, refill_rate)
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore(object):
+    """
+    Token buckets in the CONDUIT_THROTTLE_CACHE cache, shared by every
+    process using it. Reading and writing a bucket isn't atomic, so
+    concurrent requests can occasionally get one token too many.
+    """
+
+    def consume(self, key, capacity, refill_rate):
+        cache = caches[getattr(settings, 'CONDUIT_THROTTLE_CACHE', 'default')]
+        cache_key = 'conduit:throttle:{0}'.format(key)
+        now = time.time()
+
+        tokens, updated = cache.get(cache_key, (capacity, now))
+        tokens, wait = _take(tokens, updated, now, capacity, refill_rate)
+
+        # A bucket left alone this long is full again, like a missing one.
+        cache.set(cache_key, (tokens, now), int(capacity / refill_rate) + 1)
+
+        return wait
+
+    def clear(self):
+        pass
+
+
+def _take(tokens, updated, now, capacity, refill_rate):
+    """
+    Refill the bucket for the time since `updated` and take a token from
+    it. Returns the tokens left and 0, or, when the bucket is empty, the
+    tokens and the seconds until a token is available.
+    """
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+    if tokens >= 1:
+        return tokens - 1, 0
+
+    return tokens, (1 - tokens) / refill_rate
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    """Return the store named by CONDUIT_THROTTLE_STORE, a dotted path."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(getattr(
+                    settings, 'CONDUIT_THROTTLE_STORE',
+                    'conduit.apps.core.throttling.LocalBucketStore'
+                ))()
+
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle requests with a token bucket per `get_bucket_ident` value, by
+    default one per authenticated user.
+
+    The bucket's rate is CONDUIT_THROTTLE_RATES['<view.throttle_scope>_<kind>'],
+    e.g. 'login_ip'; without a rate, requests aren't throttled.
+    """
+    kind = None
+
+    def allow_request(self, request, view):
+        self.wait_time = 0
+
+        scope = '{0}_{1}'.format(getattr(view, 'throttle_scope', ''), self.kind)
+        bucket = parse_rate(
+            getattr(settings, 'CONDUIT_THROTTLE_RATES', {}).get(scope, None)
+        )
+
+        if bucket is None:
+            return True
+
+        ident = self.get_bucket_ident(request)
+
+        if ident is None:
+            return True
+
+        capacity, refill_rate = bucket
+        self.wait_time = get_bucket_store().consume(
+            '{0}:{1}'.format(scope, ident), capacity, refill_rate
+        )
+
+        return self.wait_time == 0
+
+    def get_bucket_ident(self, request):
+        """
+        Return the key of the request's bucket, or None to let the request
+        through unthrottled.
+        """
+        user = getattr(request, 'user', None)
+
+        if user is None or not user.is_authenticated:
+            return None
+
+        return 'user:{0}'.format(user.pk)
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPThrottle(TokenBucketThrottle):
+    """
+    One bucket per client address. X-Forwarded-For is only used when
+    REST_FRAMEWORK['NUM_PROXIES'] says how many proxies in front of the
+    app append to it; otherwise a client could pick a new bucket for
+    every request by sending the header itself.
+    """
+    kind = 'ip'
+
+    def get_bucket_ident(self, request):
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get('REMOTE_ADDR', None)
+
+        return self.get_ident(request)
+
+
+class EmailThrottle(TokenBucketThrottle):
+    """One bucket per email address in the `user` of the request body."""
+    kind = 'email'
+
+    def get_bucket_ident(self, request):
+        user = request.data.get('user', None)
+
+        if not isinstance(user, dict):
+            return None
+
+        email = user.get('email', None)
+
+        if not isinstance(email, str) or not email:
+            return None
+
+        return email.strip().lower()
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import metrics
+
+
+def metrics_view(request):
+    """Serve this process's request histograms to Prometheus."""
+    if not getattr(settings, 'CONDUIT_INSTRUMENTATION', True):
+        raise Http404
+
+    return HttpResponse(
+        metrics.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+class BulkRelationAPIView(APIView):
+    """
+    Add (POST) or remove (DELETE) many rows of one of the requesting
+    profile's many-to-many relations at once.
+
+    The body lists the `lookup_field` values of the targets under
+    `items_label`, e.g. `{"follows": ["jake", "jane"]}`. The targets and
+    the rows that already exist are looked up with one query each, and the
+    rest is a single `add` or `remove` on the relation's manager, so its
+    m2m_changed receivers run once for the whole batch. The response lists
+    each item with its `status`: `added`, `removed`, `unchanged` or
+    `not_found`.
+    """
+    permission_classes = (IsAuthenticated,)
+    queryset = None
+    items_label = None
+    lookup_field = None
+    # The relation on Profile, e.g. `follows`.
+    relation = None
+
+    def post(self, request):
+        return self.update_relation(request, add=True)
+
+    def delete(self, request):
+        return self.update_relation(request, add=False)
+
+    def update_relation(self, request, add):
+        keys = self.get_keys(request)
+        manager = getattr(request.user.profile, self.relation)
+
+        try:
+            with transaction.atomic():
+                targets, changed = self.apply(manager, keys, add)
+        except IntegrityError:
+            # Another request added some of the same rows first; the
+            # retry sees them and leaves them alone.
+            with transaction.atomic():
+                targets, changed = self.apply(manager, keys, add)
+
+        result = 'added' if add else 'removed'
+
+        return Response([
+            {
+                self.lookup_field.split('__')[-1]: key,
+                'status': (
+                    'not_found' if key not in targets else
+                    result if targets[key] in changed else
+                    'unchanged'
+                ),
+            }
+            for key in keys
+        ], status=status.HTTP_200_OK)
+
+    def apply(self, manager, keys, add):
+        """
+        Write the rows `keys` ask for with one `add` or `remove` and return
+        the targets found, by key, and the pks of the ones that changed.
+        """
+        targets = dict(self.queryset.filter(**{
+            self.lookup_field + '__in': keys
+        }).values_list(self.lookup_field, 'pk'))
+
+        Through = manager.through
+        existing = set(Through.objects.filter(**{
+            manager.source_field_name: manager.instance.pk,
+            manager.target_field_name + '__in': list(targets.values()),
+        }).values_list(manager.target_field_name + '_id', flat=True))
+
+        if add:
+            changed = set(targets.values()) - existing
+
+            if changed:
+                manager.add(*changed)
+        else:
+            changed = existing
+
+            if changed:
+                manager.remove(*changed)
+
+        return targets, changed
+
+    def get_keys(self, request):
+        keys = request.data.get(self.items_label, None)
+        max_items = getattr(settings, 'CONDUIT_BULK_MAX_ITEMS', 100)
+
+        if (not isinstance(keys, list) or
+                not all(isinstance(key, str) for key in keys)):
+            raise ValidationError({
+                self.items_label: 'Expected a list of strings.'
+            })
+
+        # Each item is reported once, in the order first given.
+        keys = list(dict.fromkeys(keys))
+
+        if len(keys) > max_items:
+            raise ValidationError({
+                self.items_label: 'At most {0} items per request.'.format(
+                    max_items
+                )
+            })
+
+        return keys
@@ -0,0 +1,47 @@
+# Generated by Django 2.0 on 2026-10-18 20:48
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_follow_counts(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = Profile.follows.through
+
+    def count(column):
+        follows = Follow.objects.filter(
+            **{column: OuterRef('pk')}
+        ).order_by().values(column).annotate(
+            count=Count('pk')
+        ).values('count')
+
+        return Coalesce(Subquery(follows, output_field=IntegerField()), 0)
+
+    Profile.objects.update(
+        followers_count=count('to_profile_id'),
+        following_count=count('from_profile_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_favorites'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            populate_follow_counts, migrations.RunPython.noop
+        ),
+    ]
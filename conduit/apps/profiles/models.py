@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 
 from conduit.apps.core.models import TimestampedModel
 
+from .signals import favorite_changed
+
 class Profile(TimestampedModel):
     # each user has 1 & only 1 profile
     user = models.OneToOneField(
@@ -21,6 +24,11 @@ class Profile(TimestampedModel):
         symmetrical=False
     )
 
+    # Number of profiles following this one and followed by it. Kept in
+    # step with `follows` on write so profile reads never have to count.
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+
     favorites = models.ManyToManyField(
         'articles.Article',
         related_name='favorited_by'
@@ -31,11 +39,43 @@ class Profile(TimestampedModel):
 
     def favorite(self, article):
         """Favorite `article` if we haven't already favorited it."""
-        self.favorites.add(article)
+        Favorite = self.favorites.through
+
+        try:
+            with transaction.atomic():
+                Favorite.objects.create(profile=self, article=article)
+                self._update_favorites_count(article, 1)
+        except IntegrityError:
+            # Already favorited, so the count stays as it is.
+            return
+
+        favorite_changed.send(
+            sender=Profile, instance=self, article=article, favorited=True
+        )
 
     def unfavorite(self, article):
         """Unfavorite `article` if we've already favorited it."""
-        self.favorites.remove(article)
+        Favorite = self.favorites.through
+
+        with transaction.atomic():
+            deleted, _ = Favorite.objects.filter(
+                profile=self, article=article
+            ).delete()
+
+            if deleted:
+                self._update_favorites_count(article, -1)
+
+        if deleted:
+            favorite_changed.send(
+                sender=Profile, instance=self, article=article,
+                favorited=False
+            )
+
+    def _update_favorites_count(self, article, delta):
+        self.favorites.model.objects.filter(pk=article.pk).update(
+            favorites_count=F('favorites_count') + delta
+        )
+        article.refresh_from_db(fields=['favorites_count'])
 
     def has_favorited(self, article):
         """Returns True if we have favorited `article`; else False"""
@@ -43,11 +83,14 @@ class Profile(TimestampedModel):
 
     def follow(self, profile):
         """Follow `profile` if we're not already following `profile`."""
+        # The counts are updated by the m2m_changed receivers.
         self.follows.add(profile)
+        profile.refresh_from_db(fields=['followers_count'])
 
     def unfollow(self, profile):
         """Unfollow `profile` if we're already following `profile`."""
         self.follows.remove(profile)
+        profile.refresh_from_db(fields=['followers_count'])
 
     def is_following(self, profile):
         return self.follows.filter(pk=profile.pk).exists()
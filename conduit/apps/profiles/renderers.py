@@ -2,3 +2,8 @@ from conduit.apps.core.renderers import ConduitJSONRenderer
 
 class ProfileJSONRenderer(ConduitJSONRenderer):
     object_label= 'profile'
+    object_label_plural = 'profiles'
+
+class FollowJSONRenderer(ConduitJSONRenderer):
+    object_label = 'follow'
+    object_label_plural = 'follows'
@@ -1,9 +1,33 @@
 from rest_framework import serializers
 
+from conduit.apps.core.fieldsets import SparseFieldsetMixin
+from conduit.apps.core.metrics import TimedSerializerMixin
+
 from .models import Profile
+from .viewer import get_viewer_relations
+
+DEFAULT_IMAGE = 'https://static.productionready.io/images/smiley-cyrus.jpg'
+
+
+class ProfileListSerializer(TimedSerializerMixin,
+                            serializers.ListSerializer):
+    def to_representation(self, data):
+        profiles = list(data.all() if hasattr(data, 'all') else data)
+        self.prime(profiles)
+
+        return super(ProfileListSerializer, self).to_representation(profiles)
+
+    def prime(self, profiles):
+        """Load whether the viewer follows each profile at once."""
+        relations = get_viewer_relations(self.context.get('request', None))
 
+        if relations is not None and 'following' in self.child.fields:
+            relations.prime(profile_ids=[profile.pk for profile in profiles])
 
-class ProfileSerializer(serializers.ModelSerializer):
+
+class ProfileSerializer(SparseFieldsetMixin,
+                        TimedSerializerMixin,
+                        serializers.ModelSerializer):
     username = serializers.CharField(source='user.username')
     bio = serializers.CharField(allow_blank=True, required=False)
     image = serializers.SerializerMethodField()
@@ -11,25 +35,65 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
-        fields = ('username', 'bio', 'image', 'following')
+        fields = (
+            'username',
+            'bio',
+            'image',
+            'following',
+        )
         read_only_fields = ('username',)
+        list_serializer_class = ProfileListSerializer
+
+    sparse_columns = {
+        'username': ('user__username',),
+        'bio': ('bio',),
+        'image': ('image',),
+    }
+
+    @classmethod
+    def related_columns(cls, relation):
+        """The columns a profile nested at `relation` reads, e.g. `author`."""
+        return (relation,) + tuple(
+            '{0}__{1}'.format(relation, column)
+            for columns in cls.sparse_columns.values()
+            for column in columns
+        )
 
     def get_image(self, obj):
         if obj.image:
             return obj.image
 
-        return 'https://static.productionready.io/images/smiley-cyrus.jpg'
+        return DEFAULT_IMAGE
 
     def get_following(self, instance):
-        request = self.context.get('request', None)
+        relations = get_viewer_relations(self.context.get('request', None))
 
-        if request is None:
+        if relations is None:
             return False
 
-        if not request.user.is_authenticated:
-            return False
+        return relations.is_following(instance)
+
+
+class ProfileDetailSerializer(ProfileSerializer):
+    """
+    A profile with its follow counts, for the profile endpoints. Profiles
+    nested in articles and comments leave them out.
+    """
+    followersCount = serializers.IntegerField(
+        source='followers_count', read_only=True
+    )
+    followingCount = serializers.IntegerField(
+        source='following_count', read_only=True
+    )
 
-        follower = request.user.profile
-        followee = instance
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + (
+            'followersCount',
+            'followingCount',
+        )
 
-        return follower.is_following(followee)
+    sparse_columns = dict(
+        ProfileSerializer.sparse_columns,
+        followersCount=('followers_count',),
+        followingCount=('following_count',),
+    )
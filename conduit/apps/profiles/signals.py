@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by Profile.favorite and Profile.unfavorite when the favorite was
+# actually added or removed. They write the favorites table directly, and
+# Django sends no model signals for auto-created m2m tables.
+favorite_changed = Signal(providing_args=['article', 'favorited'])
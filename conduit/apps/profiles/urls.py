@@ -1,8 +1,15 @@
 from django.urls import path
 
-from .views import ProfileRetrieveAPIView, ProfileFollowAPIView
+from .views import (
+    ProfileFollowAPIView, ProfileFollowersAPIView, ProfileFollowingAPIView,
+    ProfileRetrieveAPIView, UserFollowsAPIView
+)
 
 urlpatterns = [
     path('profiles/<username>', ProfileRetrieveAPIView.as_view()),
     path('profiles/<username>/follow', ProfileFollowAPIView.as_view()),
+    path('profiles/<username>/followers', ProfileFollowersAPIView.as_view()),
+    path('profiles/<username>/following', ProfileFollowingAPIView.as_view()),
+
+    path('user/follows', UserFollowsAPIView.as_view()),
 ]
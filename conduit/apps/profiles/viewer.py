@@ -0,0 +1,75 @@
+from .models import Profile
+
+
+class ViewerRelations(object):
+    """
+    Which profiles the requesting profile follows and which articles it
+    has favorited, loaded lazily and only for the ids being serialized.
+
+    A list serializer primes all the ids on its page with one query per
+    relation; anything not primed is loaded the first time it's asked
+    about, so nested serializers never have to query per object.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._following = {}
+        self._favorited = {}
+
+    def prime(self, profile_ids=(), article_ids=()):
+        profile_ids = set(profile_ids) - set(self._following)
+        article_ids = set(article_ids) - set(self._favorited)
+
+        if profile_ids:
+            followed = set(Profile.follows.through.objects.filter(
+                from_profile_id=self.profile.pk,
+                to_profile_id__in=profile_ids
+            ).values_list('to_profile_id', flat=True))
+
+            for pk in profile_ids:
+                self._following[pk] = pk in followed
+
+        if article_ids:
+            favorited = set(Profile.favorites.through.objects.filter(
+                profile_id=self.profile.pk,
+                article_id__in=article_ids
+            ).values_list('article_id', flat=True))
+
+            for pk in article_ids:
+                self._favorited[pk] = pk in favorited
+
+    def is_following(self, profile):
+        return self.is_following_pk(profile.pk)
+
+    def is_following_pk(self, pk):
+        if pk not in self._following:
+            self.prime(profile_ids=[pk])
+
+        return self._following[pk]
+
+    def has_favorited(self, article):
+        return self.has_favorited_pk(article.pk)
+
+    def has_favorited_pk(self, pk):
+        if pk not in self._favorited:
+            self.prime(article_ids=[pk])
+
+        return self._favorited[pk]
+
+
+def get_viewer_relations(request):
+    """
+    Return the `ViewerRelations` of the user making `request`, or None when
+    the request is anonymous. The same instance is returned for the whole
+    request.
+    """
+    if request is None or not request.user.is_authenticated:
+        return None
+
+    relations = getattr(request, '_viewer_relations', None)
+
+    if relations is None:
+        relations = ViewerRelations(request.user.profile)
+        request._viewer_relations = relations
+
+    return relations
@@ -1,25 +1,38 @@
 from rest_framework import serializers, status
 from rest_framework.exceptions import NotFound
-from rest_framework.generics import RetrieveUpdateAPIView
+from rest_framework.generics import ListAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+from conduit.apps.core.fieldsets import restrict_queryset
+from conduit.apps.core.mixins import StreamingListMixin
+from conduit.apps.core.pagination import KeysetPagination
+from conduit.apps.core.views import BulkRelationAPIView
+
 from .models import Profile
-from .renderers import ProfileJSONRenderer
-from .serializers import ProfileSerializer
+from .renderers import FollowJSONRenderer, ProfileJSONRenderer
+from .serializers import ProfileDetailSerializer
 
 
 class ProfileRetrieveAPIView(RetrieveUpdateAPIView):
     permission_classes = (AllowAny, )
-    queryset = Profile.objects.select_related('user')
+    # Deactivated profiles are hidden.
+    queryset = Profile.objects.select_related('user').filter(
+        user__is_active=True
+    )
+    read_from_replica = True
     renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = (ProfileSerializer)
+    serializer_class = (ProfileDetailSerializer)
 
     def retrieve(self, request, username, *args, **kwargs):
+        queryset = restrict_queryset(
+            self.queryset, request, self.serializer_class
+        )
+
         try:
-            profile = self.queryset.get(user__username=username)
+            profile = queryset.get(user__username=username)
         except Profile.DoesNotExist:
             raise NotFound('A profile with this username does not exist.')
 
@@ -31,14 +44,16 @@ class ProfileRetrieveAPIView(RetrieveUpdateAPIView):
 
 class ProfileFollowAPIView(APIView):
     permission_classes = (IsAuthenticated,)
+    # Deactivated profiles can't be followed.
+    queryset = Profile.objects.filter(user__is_active=True)
     renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileDetailSerializer
 
     def delete(self, request, username=None):
         follower = self.request.user.profile
 
         try:
-            followee = Profile.objects.get(user__username=username)
+            followee = self.queryset.get(user__username=username)
         except Profile.DoesNotExist:
             raise NotFound('A profile with this username was not found.')
 
@@ -54,7 +69,7 @@ class ProfileFollowAPIView(APIView):
         follower = self.request.user.profile
 
         try:
-            followee = Profile.objects.get(user__username=username)
+            followee = self.queryset.get(user__username=username)
         except Profile.DoesNotExist:
             raise NotFound('A profile with this username was not found')
 
@@ -65,3 +80,64 @@ class ProfileFollowAPIView(APIView):
         })
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class FollowPagination(KeysetPagination):
+    # The follows table has no timestamps, but its ids only go up, so this
+    # lists the newest follows first. The index on each profile column of
+    # the table ends in the id, so a page is a single index range scan.
+    ordering = ('-id',)
+
+
+class ProfileFollowersAPIView(StreamingListMixin, ListAPIView):
+    permission_classes = (AllowAny,)
+    queryset = Profile.objects.select_related('user').filter(
+        user__is_active=True
+    )
+    read_from_replica = True
+    renderer_classes = (ProfileJSONRenderer,)
+    serializer_class = ProfileDetailSerializer
+    pagination_class = FollowPagination
+
+    # The follows column matching the requested profile, and the one
+    # holding the profiles to list.
+    lookup_column = 'to_profile_id'
+    listed_column = 'from_profile_id'
+
+    def get_follows(self, username):
+        try:
+            profile_id = self.queryset.values_list('pk', flat=True).get(
+                user__username=username
+            )
+        except Profile.DoesNotExist:
+            raise NotFound('A profile with this username does not exist.')
+
+        return Profile.follows.through.objects.filter(
+            **{self.lookup_column: profile_id}
+        ).values('id', self.listed_column)
+
+    def list(self, request, username=None):
+        page = self.paginate_queryset(self.get_follows(username))
+        ids = [row[self.listed_column] for row in page]
+
+        profiles = restrict_queryset(
+            self.queryset, request, self.serializer_class
+        ).in_bulk(ids)
+        page = [profiles[pk] for pk in ids if pk in profiles]
+
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_list_response(page, serializer)
+
+
+class ProfileFollowingAPIView(ProfileFollowersAPIView):
+    lookup_column = 'from_profile_id'
+    listed_column = 'to_profile_id'
+
+
+class UserFollowsAPIView(BulkRelationAPIView):
+    queryset = Profile.objects.filter(user__is_active=True)
+    renderer_classes = (FollowJSONRenderer,)
+    items_label = 'follows'
+    lookup_field = 'user__username'
+    relation = 'follows'
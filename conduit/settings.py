@@ -54,6 +54,8 @@ LOCAL_APPS = (
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'conduit.apps.core.middleware.InstrumentationMiddleware',
+    'conduit.apps.core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'conduit.apps.core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'conduit.urls'
@@ -94,6 +97,32 @@ DATABASES = {
     }
 }
 
+# Optional read replica, e.g. a second SQLite file kept in step with the
+# first. Safe requests to views with `read_from_replica = True` read from
+# it; see conduit.apps.core.middleware.ReplicaRoutingMiddleware.
+if os.environ.get('CONDUIT_REPLICA_DATABASE'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['CONDUIT_REPLICA_DATABASE'],
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    }
+
+DATABASE_ROUTERS = ['conduit.apps.core.dbrouters.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.0/topics/cache/
+# Anonymous article responses are cached here. Use a backend shared by all
+# workers (e.g. memcached) in production so invalidation reaches them all.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.10/ref/settings/#auth-password-validators
@@ -142,4 +171,73 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'conduit.apps.authentication.backends.JWTAuthentication',
     ),
+
+    # Number of proxies in front of the app that append to X-Forwarded-For.
+    # Left unset, IPThrottle ignores the header and uses REMOTE_ADDR.
+    'NUM_PROXIES': None,
+}
+
+# Encoder used by ConduitJSONRenderer. Falls back to the stdlib json module
+# when the backend isn't installed.
+CONDUIT_JSON_BACKEND = 'orjson'
+
+# Stream list responses of at least CONDUIT_STREAMING_MIN_ITEMS items
+# instead of rendering them into a single buffer.
+CONDUIT_STREAMING_RESPONSES = False
+CONDUIT_STREAMING_MIN_ITEMS = 50
+
+# Number of articles kept in each profile's feed timeline. New articles are
+# added without trimming; the `trim_timelines` command trims them back.
+CONDUIT_FEED_TIMELINE_LENGTH = 1000
+
+# JWTAuthentication keeps up to CONDUIT_JWT_CACHE_SIZE verified tokens and
+# caches active users for CONDUIT_USER_CACHE_TTL seconds.
+CONDUIT_JWT_CACHE_SIZE = 1024
+CONDUIT_USER_CACHE_TTL = 30
+
+# Cache alias and timeout (in seconds) for anonymous article responses.
+CONDUIT_RESPONSE_CACHE = 'default'
+CONDUIT_RESPONSE_CACHE_TIMEOUT = 60
+
+# Number of tags returned by /api/tags, and how long (in seconds) each
+# process keeps them.
+CONDUIT_POPULAR_TAGS_LIMIT = 20
+CONDUIT_POPULAR_TAGS_TTL = 10
+
+# Database alias of the read replica, and how long (in seconds) a client
+# keeps reading from the primary after a write. The window is shared
+# through CONDUIT_RESPONSE_CACHE, which must be shared between processes
+# for it to hold across them.
+CONDUIT_REPLICA_ALIAS = 'replica'
+CONDUIT_REPLICA_STICKY_SECONDS = 10
+
+# Per-view timings in a Server-Timing header and at /metrics.
+CONDUIT_INSTRUMENTATION = True
+
+# Token-bucket throttles on login and registration, which hash passwords.
+# A rate of 'N/period' allows bursts of N requests and N per period after
+# that, per client address ('_ip') and per email address ('_email').
+# CONDUIT_THROTTLE_STORE keeps the buckets in this process; use
+# CacheBucketStore to share them through CONDUIT_THROTTLE_CACHE.
+CONDUIT_THROTTLE_RATES = {
+    'login_ip': '20/min',
+    'login_email': '10/min',
+    'registration_ip': '10/hour',
+    'registration_email': '5/hour',
 }
+CONDUIT_THROTTLE_STORE = 'conduit.apps.core.throttling.LocalBucketStore'
+CONDUIT_THROTTLE_CACHE = 'default'
+
+# Build article list and retrieve responses from values() rows instead of
+# ArticleSerializer; see conduit.apps.articles.fastpath.
+CONDUIT_ARTICLE_FAST_PATH = True
+
+# Responses of at least CONDUIT_COMPRESSION_MIN_SIZE bytes are compressed
+# with brotli, if the brotli package is installed, or gzip.
+CONDUIT_COMPRESSION_MIN_SIZE = 1024
+CONDUIT_GZIP_LEVEL = 6
+CONDUIT_BROTLI_QUALITY = 5
+
+# Most usernames or slugs one request to the bulk follow and favorite
+# endpoints may name.
+CONDUIT_BULK_MAX_ITEMS = 100
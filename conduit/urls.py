@@ -16,9 +16,14 @@ Including another URLconf
 from django.urls import path, include
 from django.contrib import admin
 from django.conf.urls import url
+
+from conduit.apps.core.views import metrics_view
+
 urlpatterns = [
     path(r'admin/', admin.site.urls),
 
+    path('metrics', metrics_view, name='metrics'),
+
     path('api/', include('conduit.apps.articles.urls'), name='articles'),
     url(r'api/', include('conduit.apps.authentication.urls'), name='authentication'),
     path('api/', include('conduit.apps.profiles.urls'), name='profiles')